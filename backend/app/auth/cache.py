@@ -0,0 +1,42 @@
+import time
+from typing import Dict, Optional
+from app.core.cache import LRUCache
+from app.core.config import settings
+
+class AuthCache:
+    """Verified token claims and user documents, so authenticated requests skip JWT checks and MongoDB.
+
+    Tokens are kept until they expire; users for at most AUTH_USER_CACHE_TTL seconds and never
+    past the expiry of the token that loaded them. AuthService invalidates a user whenever it
+    writes their document; writes made outside the app show up once the TTL runs out.
+    """
+    
+    def __init__(self):
+        self.tokens = LRUCache(max_entries=settings.AUTH_CACHE_MAX_ENTRIES)
+        self.users = LRUCache(max_entries=settings.AUTH_CACHE_MAX_ENTRIES)
+    
+    def get_claims(self, token: str) -> Optional[Dict]:
+        return self.tokens.get(token)
+    
+    def put_claims(self, token: str, claims: Dict):
+        self.tokens.put(token, claims, expires_at=claims.get("exp"))
+    
+    def get_user(self, email: str) -> Optional[Dict]:
+        user = self.users.get(email)
+        return dict(user) if user is not None else None
+    
+    def put_user(self, email: str, user: Dict, token_expires_at: Optional[float] = None):
+        expires_at = time.time() + settings.AUTH_USER_CACHE_TTL
+        if token_expires_at is not None:
+            expires_at = min(expires_at, token_expires_at)
+        self.users.put(email, dict(user), expires_at=expires_at)
+    
+    def invalidate_user(self, email: str):
+        """Forget a user after their document changed"""
+        self.users.pop(email)
+    
+    def stats(self) -> Dict:
+        return {"tokens": self.tokens.stats(), "users": self.users.stats()}
+
+
+auth_cache = AuthCache()
@@ -2,7 +2,9 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from app.auth.schemas import UserRegister, UserLogin, Token, UserResponse
 from app.auth.service import AuthService
+from app.auth.cache import auth_cache
 from app.core.security import decode_access_token
+from app.core.workers import worker_pools
 
 router = APIRouter()
 security = HTTPBearer()
@@ -10,25 +12,31 @@ security = HTTPBearer()
 async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)) -> dict:
     """Dependency to get current authenticated user with workspace_id from JWT"""
     token = credentials.credentials
-    payload = decode_access_token(token)
+    payload = auth_cache.get_claims(token)
     
     if payload is None:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid or expired token",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+        payload = decode_access_token(token)
+        
+        if payload is None:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid or expired token",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        
+        if payload.get("sub") is None or payload.get("workspace_id") is None:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid token payload"
+            )
+        
+        auth_cache.put_claims(token, payload)
     
-    email = payload.get("sub")
-    workspace_id = payload.get("workspace_id")
-    
-    if email is None or workspace_id is None:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid token payload"
-        )
-    
-    user = await AuthService.get_user_by_email(email)
+    email = payload["sub"]
+    user = auth_cache.get_user(email)
+    if user is None:
+        user = await AuthService.get_user_by_email(email)
+        auth_cache.put_user(email, user, payload.get("exp"))
     return user
 
 @router.post("/register", status_code=status.HTTP_201_CREATED)
@@ -45,3 +53,13 @@ async def login(credentials: UserLogin):
 async def get_me(current_user: dict = Depends(get_current_user)):
     """Get current authenticated user"""
     return current_user
+
+@router.get("/cache/stats")
+async def get_cache_stats(current_user: dict = Depends(get_current_user)):
+    """Hit rates of the token and user caches"""
+    return auth_cache.stats()
+
+@router.get("/hashing/stats")
+async def get_hashing_stats(current_user: dict = Depends(get_current_user)):
+    """Queue depth and wait times of the password hashing threads"""
+    return worker_pools.get_auth_pool().stats()
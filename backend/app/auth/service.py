@@ -3,9 +3,18 @@ from fastapi import HTTPException, status
 from app.db.mongo import mongodb
 from app.core.security import hash_password, verify_password, create_access_token
 from app.auth.schemas import UserRegister, UserLogin
+from app.auth.cache import auth_cache
+from app.core.workers import worker_pools
 from bson import ObjectId
+from pymongo.errors import DuplicateKeyError
 import uuid
 
+# Only fetch the fields each query uses; never load password hashes for profile lookups
+EXISTS_PROJECTION = {"_id": 1}
+LOGIN_PROJECTION = {"email": 1, "workspace_id": 1, "hashed_password": 1}
+PROFILE_PROJECTION = {"name": 1, "email": 1, "workspace_id": 1, "created_at": 1}
+
+# Every write to a user document goes through AuthService, which invalidates the auth cache
 class AuthService:
     @staticmethod
     async def register_user(user_data: UserRegister) -> dict:
@@ -13,13 +22,16 @@ class AuthService:
         users = mongodb.get_users_collection()
         
         # Check if email already exists
-        existing_user = await users.find_one({"email": user_data.email})
+        existing_user = await users.find_one({"email": user_data.email}, EXISTS_PROJECTION)
         if existing_user:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Email already registered"
             )
         
+        # bcrypt is slow on purpose; keep it off the event loop
+        hashed_password = await worker_pools.get_auth_pool().run(hash_password, user_data.password)
+        
         # Create workspace_id for user
         workspace_id = str(uuid.uuid4())
         
@@ -27,13 +39,20 @@ class AuthService:
         user_doc = {
             "name": user_data.name,
             "email": user_data.email,
-            "hashed_password": hash_password(user_data.password),
+            "hashed_password": hashed_password,
             "workspace_id": workspace_id,
             "created_at": datetime.utcnow()
         }
         
-        # Insert into MongoDB
-        result = await users.insert_one(user_doc)
+        # Insert into MongoDB; the unique email index catches concurrent registrations
+        try:
+            result = await users.insert_one(user_doc)
+        except DuplicateKeyError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Email already registered"
+            )
+        auth_cache.invalidate_user(user_data.email)
         
         return {
             "message": "User registered successfully",
@@ -46,7 +65,7 @@ class AuthService:
         users = mongodb.get_users_collection()
         
         # Find user by email
-        user = await users.find_one({"email": credentials.email})
+        user = await users.find_one({"email": credentials.email}, LOGIN_PROJECTION)
         if not user:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -54,7 +73,10 @@ class AuthService:
             )
         
         # Verify password
-        if not verify_password(credentials.password, user["hashed_password"]):
+        password_ok = await worker_pools.get_auth_pool().run(
+            verify_password, credentials.password, user["hashed_password"]
+        )
+        if not password_ok:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid email or password"
@@ -75,7 +97,7 @@ class AuthService:
     async def get_user_by_email(email: str) -> dict:
         """Get user by email"""
         users = mongodb.get_users_collection()
-        user = await users.find_one({"email": email})
+        user = await users.find_one({"email": email}, PROFILE_PROJECTION)
         
         if not user:
             raise HTTPException(
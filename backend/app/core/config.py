@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import List, Optional
 
 
 class Settings(BaseSettings):
@@ -15,11 +15,61 @@ class Settings(BaseSettings):
     UPLOAD_DIR: str = "uploads"
     MAX_FILE_SIZE: int = 50 * 1024 * 1024
     DATABASE_URL: str = "sqlite:///./smartdoc.db"
+    ASYNC_DATABASE_URL: Optional[str] = None
+    SQLITE_MMAP_SIZE: int = 256 * 1024 * 1024
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    EXPORT_BATCH_SIZE: int = 200
+    CONTENT_COMPRESSION_LEVEL: int = 6
+
+    ANALYSIS_WORKERS: int = 2
+    ANALYSIS_QUEUE_DEPTH: int = 16
+    JOB_EVENTS_HEARTBEAT: int = 15
+    ANALYSIS_CACHE_MAX_ENTRIES: int = 256
+    ANALYSIS_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+
+    API_SCAN_WORKERS: int = 8
+    API_SCAN_MAX_FILE_BYTES: int = 512 * 1024
+
+    GIT_CLONE_CONCURRENCY: int = 4
+    GIT_CLONE_TIMEOUT: int = 60
+    # Accept file:// repositories as well as GitHub URLs; for tests and local development only
+    GIT_ALLOW_FILE_URLS: bool = False
+
+    SUMMARY_BLOCK_CHARS: int = 256 * 1024
+    SUMMARY_PENDING_BLOCKS: int = 4
+    SUMMARY_WORKERS: int = 2
+
+    PDF_MAX_PAGES: int = 2000
+    PDF_PAGES_PER_TASK: int = 25
+    PDF_EXTRACT_TIMEOUT: int = 120
+    PDF_WORKERS: int = 2
+
+    SUMMARY_CACHE_MAX_ENTRIES: int = 128
+    SUMMARY_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    SUMMARY_CACHE_DIR: str = "uploads/summary_cache"
+    SUMMARY_CACHE_DISK_MAX_BYTES: int = 512 * 1024 * 1024
+    SUMMARY_CACHE_STATS_WORKSPACES: int = 10000
+
+    SUMMARY_BATCH_MAX_FILES: int = 50
+    SUMMARY_BATCH_CONCURRENCY: int = 4
+    SUMMARY_BATCH_MAX_FILE_BYTES: int = 20 * 1024 * 1024
+
+    AUTH_CACHE_MAX_ENTRIES: int = 10000
+    AUTH_USER_CACHE_TTL: int = 300
+    AUTH_HASH_WORKERS: int = 2
+    AUTH_HASH_QUEUE_DEPTH: int = 64
 
     # ⭐ ADD THESE TWO LINES
     MONGODB_URL: str
     JWT_SECRET_KEY: str
 
+    MONGODB_MAX_POOL_SIZE: int = 100
+    MONGODB_MIN_POOL_SIZE: int = 0
+    MONGODB_MAX_IDLE_TIME_MS: int = 300000
+    MONGODB_SERVER_SELECTION_TIMEOUT_MS: int = 5000
+    MONGODB_CONNECT_TIMEOUT_MS: int = 5000
+    MONGODB_SOCKET_TIMEOUT_MS: int = 20000
+
     class Config:
         env_file = ".env"
 
@@ -0,0 +1,132 @@
+"""Schema migrations for the metadata store.
+
+The schema version lives in SQLite's PRAGMA user_version and each migration runs once,
+in order. SQLite DDL is not reliably transactional here, and fresh databases already get
+their tables from `Base.metadata.create_all`, so every migration must be idempotent.
+"""
+import json
+import logging
+from typing import Callable, List, Set
+from sqlalchemy import inspect, select, text
+from sqlalchemy.engine import Connection, Engine
+from app.models.database import CONTENT_FIELDS, DocumentContent, content_digest
+from app.models.search import CREATE_FTS_TABLE, SEARCH_FIELDS, index_project
+
+logger = logging.getLogger(__name__)
+
+
+def _column_names(conn: Connection, table: str) -> Set[str]:
+    return {column["name"] for column in inspect(conn).get_columns(table)}
+
+
+def _add_columns_from_older_releases(conn: Connection):
+    """Columns added after the first release: workspace scoping, mirrors and stored health"""
+    additions = {
+        "projects": [
+            ("workspace_id", "VARCHAR NOT NULL DEFAULT 'legacy_workspace'"),
+            ("repo_url", "VARCHAR"),
+            ("commit_sha", "VARCHAR"),
+            ("analyzer_version", "VARCHAR"),
+            ("health_json", "JSON"),
+            ("insights_json", "JSON"),
+            ("health_version", "VARCHAR")
+        ],
+        "documentations": [
+            ("workspace_id", "VARCHAR NOT NULL DEFAULT 'legacy_workspace'")
+        ]
+    }
+    for table, columns in additions.items():
+        existing = _column_names(conn, table)
+        for name, definition in columns:
+            if name not in existing:
+                conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {name} {definition}"))
+
+    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_projects_workspace_id ON projects (workspace_id)"))
+    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_documentations_workspace_id ON documentations (workspace_id)"))
+    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_projects_repo_url ON projects (repo_url)"))
+
+
+def _add_listing_indexes(conn: Connection):
+    """Composite indexes behind keyset pagination of workspace listings"""
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_projects_workspace_created ON projects (workspace_id, created_at, id)"
+    ))
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_documentations_workspace_created ON documentations (workspace_id, created_at, id)"
+    ))
+
+
+def _add_project_search_index(conn: Connection):
+    """Full-text index over projects, filled from the existing rows"""
+    conn.execute(text(CREATE_FTS_TABLE))
+    # Projects kept their text inline until migration 4; newer databases have no rows yet
+    if "readme_content" not in _column_names(conn, "projects"):
+        return
+    fields = ", ".join(name for name, _ in SEARCH_FIELDS)
+    for row in conn.execute(text(f"SELECT id, workspace_id, {fields} FROM projects")).mappings():
+        index_project(conn, row["id"], row["workspace_id"], row)
+
+
+def _move_content_to_shared_table(conn: Connection):
+    """Store generated text once, compressed, in `contents` instead of inline on both tables"""
+    DocumentContent.__table__.create(conn, checkfirst=True)
+    contents = DocumentContent.__table__
+    for table in ("documentations", "projects"):
+        if "content_id" not in _column_names(conn, table):
+            conn.execute(text(f"ALTER TABLE {table} ADD COLUMN content_id INTEGER REFERENCES contents (id)"))
+        conn.execute(text(f"CREATE INDEX IF NOT EXISTS ix_{table}_content_id ON {table} (content_id)"))
+        if "readme_content" not in _column_names(conn, table):
+            continue
+
+        rows = conn.execute(text(
+            f"SELECT id, {', '.join(CONTENT_FIELDS)} FROM {table} WHERE content_id IS NULL"
+        )).mappings().all()
+        for row in rows:
+            fields = dict(row)
+            for name in ("tech_stack", "api_endpoints"):
+                fields[name] = json.loads(fields[name]) if fields[name] is not None else None
+            digest = content_digest(fields)
+            content_id = conn.execute(select(contents.c.id).where(contents.c.digest == digest).limit(1)).scalar()
+            if content_id is None:
+                values = {name: fields[name] for name in CONTENT_FIELDS}
+                content_id = conn.execute(contents.insert().values(digest=digest, **values)).inserted_primary_key[0]
+            conn.execute(text(f"UPDATE {table} SET content_id = :content_id WHERE id = :id"),
+                         {"content_id": content_id, "id": row["id"]})
+
+        for name in CONTENT_FIELDS:
+            conn.execute(text(f"ALTER TABLE {table} DROP COLUMN {name}"))
+
+
+# Append only; the position of a migration is its version number
+MIGRATIONS: List[Callable[[Connection], None]] = [
+    _add_columns_from_older_releases,
+    _add_listing_indexes,
+    _add_project_search_index,
+    _move_content_to_shared_table
+]
+
+# Migrations that free enough pages to be worth a VACUUM afterwards
+RECLAIMS_SPACE = {_move_content_to_shared_table}
+
+
+def run_migrations(engine: Engine):
+    """Bring the database up to the latest schema version"""
+    if engine.dialect.name != "sqlite":
+        logger.warning(f"Schema migrations only track SQLite databases; skipping for {engine.dialect.name}")
+        return
+
+    with engine.connect() as conn:
+        version = conn.execute(text("PRAGMA user_version")).scalar()
+
+    pending = MIGRATIONS[version:]
+    for number, migration in enumerate(pending, start=version + 1):
+        with engine.begin() as conn:
+            migration(conn)
+            conn.execute(text(f"PRAGMA user_version = {number}"))
+        logger.info(f"Applied schema migration {number}: {migration.__name__}")
+
+    if RECLAIMS_SPACE.intersection(pending):
+        # VACUUM cannot run inside a transaction
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            conn.execute(text("VACUUM"))
+        logger.info("Compacted the database after migrating")
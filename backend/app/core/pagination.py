@@ -0,0 +1,49 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, Optional, Tuple
+from fastapi import HTTPException
+from sqlalchemy import Select, and_, or_
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+def encode_cursor(created_at: datetime, row_id: Any) -> str:
+    """Opaque token for the position just after a row"""
+    raw = json.dumps({"created_at": created_at.isoformat(), "id": row_id})
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[datetime, Any]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        position = json.loads(raw)
+        return datetime.fromisoformat(position["created_at"]), position["id"]
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def keyset_page(query: Select, model, cursor: Optional[str], limit: int, newest_first: bool = True) -> Select:
+    """Order `query` by (created_at, id) and start it after `cursor`.
+
+    Fetches one row more than `limit` so the caller can tell whether another page exists.
+    """
+    if newest_first:
+        query = query.order_by(model.created_at.desc(), model.id.desc())
+    else:
+        query = query.order_by(model.created_at.asc(), model.id.asc())
+
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        if newest_first:
+            after = or_(model.created_at < created_at, and_(model.created_at == created_at, model.id < row_id))
+        else:
+            after = or_(model.created_at > created_at, and_(model.created_at == created_at, model.id > row_id))
+        query = query.where(after)
+
+    return query.limit(limit + 1)
+
+def next_cursor(rows: list, limit: int) -> Optional[str]:
+    """Trim the extra row fetched by keyset_page; return the cursor of the following page"""
+    if len(rows) <= limit:
+        return None
+    del rows[limit:]
+    last = rows[-1]
+    return encode_cursor(last.created_at, last.id)
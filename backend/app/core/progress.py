@@ -0,0 +1,59 @@
+import time
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, Optional
+
+class JobCancelled(Exception):
+    """Raised at the next stage boundary once a job has been cancelled"""
+
+
+class StageReporter:
+    """Reports the start and end of pipeline stages with timings and counts.
+
+    `sink` receives one event dict per call and `cancel` is any object with `is_set()`.
+    Both are called inline, so they must be cheap; code handing the reporter to a worker
+    process passes the one from `in_worker()` instead.
+    """
+
+    def __init__(self, sink: Optional[Callable[[Dict], Any]] = None, cancel: Optional[Any] = None):
+        self.sink = sink
+        self.cancel = cancel
+
+    def emit(self, stage: str, status: str, **details):
+        if self.sink is not None:
+            self.sink({"stage": stage, "status": status, "at": time.time(), **details})
+
+    @asynccontextmanager
+    async def in_worker(self) -> AsyncIterator["StageReporter"]:
+        """The reporter to pass to a worker process for the duration of the block.
+
+        This base version yields the reporter itself, which only works for work run in
+        this process or when `sink` and `cancel` pickle; JobReporter overrides it with
+        manager-backed ones.
+        """
+        yield self
+
+    def check_cancelled(self):
+        if self.cancel is not None and self.cancel.is_set():
+            raise JobCancelled()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[Dict]:
+        """Time a stage; counts put in the yielded dict are sent with its finish event"""
+        self.check_cancelled()
+        details: Dict = {}
+        self.emit(name, "started")
+        started = time.perf_counter()
+        try:
+            yield details
+        except BaseException as e:
+            self.emit(name, "failed", duration_ms=_elapsed_ms(started), error=str(e) or type(e).__name__)
+            raise
+        self.emit(name, "finished", duration_ms=_elapsed_ms(started), **details)
+
+
+def _elapsed_ms(started: float) -> float:
+    return round((time.perf_counter() - started) * 1000, 1)
+
+
+# Default for callers that do not report progress
+NULL_REPORTER = StageReporter()
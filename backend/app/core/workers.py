@@ -0,0 +1,158 @@
+import asyncio
+import multiprocessing
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing.managers import SyncManager
+from typing import Any, Callable, Dict, Optional
+from fastapi import HTTPException
+from app.core.config import settings
+
+class BoundedThreadPool:
+    """Thread pool that refuses work once too many tasks are waiting, with queueing metrics"""
+    
+    def __init__(self, name: str, max_workers: int, max_queued: int):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+        self.max_workers = max_workers
+        self.max_queued = max_queued
+        self._lock = threading.Lock()
+        self.queued = 0
+        self.running = 0
+        self.completed = 0
+        self.rejected = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.run_seconds = 0.0
+    
+    async def run(self, func: Callable, *args) -> Any:
+        with self._lock:
+            if self.queued >= self.max_queued:
+                self.rejected += 1
+                raise HTTPException(status_code=503, detail="Server is busy, try again shortly")
+            self.queued += 1
+        
+        future = self.executor.submit(self._call, time.perf_counter(), func, args)
+        future.add_done_callback(self._forget_cancelled)
+        return await asyncio.wrap_future(future)
+    
+    def _call(self, submitted: float, func: Callable, args: tuple) -> Any:
+        started = time.perf_counter()
+        with self._lock:
+            self.queued -= 1
+            self.running += 1
+            self.wait_seconds += started - submitted
+            self.max_wait_seconds = max(self.max_wait_seconds, started - submitted)
+        try:
+            return func(*args)
+        finally:
+            with self._lock:
+                self.running -= 1
+                self.completed += 1
+                self.run_seconds += time.perf_counter() - started
+    
+    def _forget_cancelled(self, future: Future):
+        # Tasks cancelled before they started never reach _call
+        if future.cancelled():
+            with self._lock:
+                self.queued -= 1
+    
+    def stats(self) -> Dict:
+        with self._lock:
+            started = self.running + self.completed
+            return {
+                "workers": self.max_workers,
+                "queued": self.queued,
+                "running": self.running,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "avg_wait_ms": round(self.wait_seconds / started * 1000, 1) if started else 0.0,
+                "max_wait_ms": round(self.max_wait_seconds * 1000, 1),
+                "avg_run_ms": round(self.run_seconds / self.completed * 1000, 1) if self.completed else 0.0
+            }
+    
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+class WorkerPools:
+    process_pool: Optional[ProcessPoolExecutor] = None
+    pdf_pool: Optional[ProcessPoolExecutor] = None
+    summary_pool: Optional[ProcessPoolExecutor] = None
+    manager: Optional[SyncManager] = None
+    auth_pool: Optional[BoundedThreadPool] = None
+    _manager_lock = threading.Lock()
+    
+    @classmethod
+    def get_process_pool(cls) -> ProcessPoolExecutor:
+        if cls.process_pool is None:
+            cls.process_pool = ProcessPoolExecutor(max_workers=settings.ANALYSIS_WORKERS)
+        return cls.process_pool
+    
+    @classmethod
+    def get_pdf_pool(cls) -> ProcessPoolExecutor:
+        """Processes for PDF text extraction, kept apart so slow documents cannot starve analysis jobs"""
+        if cls.pdf_pool is None:
+            cls.pdf_pool = ProcessPoolExecutor(max_workers=settings.PDF_WORKERS)
+        return cls.pdf_pool
+    
+    @classmethod
+    def get_summary_pool(cls) -> ProcessPoolExecutor:
+        """Processes for document summaries, so a large batch cannot hold up analysis jobs"""
+        if cls.summary_pool is None:
+            cls.summary_pool = ProcessPoolExecutor(max_workers=settings.SUMMARY_WORKERS)
+        return cls.summary_pool
+    
+    @classmethod
+    def get_auth_pool(cls) -> BoundedThreadPool:
+        """Threads for password hashing, which would otherwise stall the event loop"""
+        if cls.auth_pool is None:
+            cls.auth_pool = BoundedThreadPool("auth", settings.AUTH_HASH_WORKERS, settings.AUTH_HASH_QUEUE_DEPTH)
+        return cls.auth_pool
+    
+    @classmethod
+    def get_manager(cls) -> SyncManager:
+        """Server for queues and events shared with the worker processes"""
+        with cls._manager_lock:
+            if cls.manager is None:
+                cls.manager = multiprocessing.Manager()
+            return cls.manager
+    
+    @classmethod
+    async def run_in_process(cls, func: Callable, *args) -> Any:
+        """Run a picklable function on the shared process pool.
+
+        A call that has already started cannot be interrupted, so when the caller is
+        cancelled this waits for the worker to finish before re-raising. Callers can then
+        clean up the worker's inputs safely.
+        """
+        future = cls.get_process_pool().submit(func, *args)
+        result = asyncio.wrap_future(future)
+        try:
+            return await asyncio.shield(result)
+        except asyncio.CancelledError:
+            if not future.cancel():
+                await asyncio.wait([result])
+                # Nobody is waiting for the outcome any more
+                result.exception()
+            raise
+    
+    @classmethod
+    def shutdown(cls):
+        if cls.process_pool:
+            cls.process_pool.shutdown(wait=False, cancel_futures=True)
+            cls.process_pool = None
+        if cls.pdf_pool:
+            cls.pdf_pool.shutdown(wait=False, cancel_futures=True)
+            cls.pdf_pool = None
+        if cls.summary_pool:
+            cls.summary_pool.shutdown(wait=False, cancel_futures=True)
+            cls.summary_pool = None
+        if cls.manager:
+            cls.manager.shutdown()
+            cls.manager = None
+        if cls.auth_pool:
+            cls.auth_pool.shutdown()
+            cls.auth_pool = None
+
+
+worker_pools = WorkerPools()
@@ -1,6 +1,16 @@
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ASCENDING, IndexModel
+from pymongo.errors import PyMongoError
 from typing import Optional
 from app.core.config import settings   # ⭐ IMPORTANT
+import logging
+
+logger = logging.getLogger(__name__)
+
+USER_INDEXES = [
+    IndexModel([("email", ASCENDING)], unique=True, name="email_unique"),
+    IndexModel([("workspace_id", ASCENDING)], name="workspace_id")
+]
 
 class MongoDB:
     client: Optional[AsyncIOMotorClient] = None
@@ -12,8 +22,26 @@ class MongoDB:
         if not mongodb_url:
             raise ValueError("MONGODB_URL not found in settings")
         
-        cls.client = AsyncIOMotorClient(mongodb_url)
+        cls.client = AsyncIOMotorClient(
+            mongodb_url,
+            maxPoolSize=settings.MONGODB_MAX_POOL_SIZE,
+            minPoolSize=settings.MONGODB_MIN_POOL_SIZE,
+            maxIdleTimeMS=settings.MONGODB_MAX_IDLE_TIME_MS,
+            serverSelectionTimeoutMS=settings.MONGODB_SERVER_SELECTION_TIMEOUT_MS,
+            connectTimeoutMS=settings.MONGODB_CONNECT_TIMEOUT_MS,
+            socketTimeoutMS=settings.MONGODB_SOCKET_TIMEOUT_MS
+        )
         print("✅ Connected to MongoDB Atlas")
+        await cls.ensure_indexes()
+    
+    @classmethod
+    async def ensure_indexes(cls):
+        """Create the indexes user lookups rely on; existing ones are left as they are"""
+        try:
+            await cls.get_users_collection().create_indexes(USER_INDEXES)
+        except PyMongoError as e:
+            # Keep serving; duplicate emails or an unreachable server must not block startup
+            logger.error(f"Could not ensure MongoDB indexes: {str(e)}")
     
     @classmethod
     async def close_db(cls):
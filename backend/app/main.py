@@ -1,16 +1,19 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
-from app.core.database import engine, Base
-from app.routes import upload, documentation, projects, summarization
+from app.core.database import engine, async_engine, Base
+from app.core.migrations import run_migrations
+from app.routes import upload, documentation, projects, summarization, jobs
 from app.auth import routes as auth_routes
 from app.db.mongo import mongodb
+from app.core.workers import worker_pools
 import logging
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 Base.metadata.create_all(bind=engine)
+run_migrations(engine)
 
 app = FastAPI(title=settings.PROJECT_NAME, version=settings.VERSION)
 
@@ -21,6 +24,8 @@ async def startup_event():
 @app.on_event("shutdown")
 async def shutdown_event():
     await mongodb.close_db()
+    await async_engine.dispose()
+    worker_pools.shutdown()
 
 app.add_middleware(
     CORSMiddleware,
@@ -28,10 +33,12 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 app.include_router(auth_routes.router, prefix="/api/auth", tags=["auth"])
 app.include_router(upload.router, prefix="/api/upload", tags=["upload"])
+app.include_router(jobs.router, prefix="/api/jobs", tags=["jobs"])
 app.include_router(documentation.router, prefix="/api/docs", tags=["documentation"])
 app.include_router(projects.router, prefix="/api/projects", tags=["projects"])
 app.include_router(summarization.router, prefix="/api/summarize", tags=["summarization"])
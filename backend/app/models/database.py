@@ -1,10 +1,45 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, JSON
+from sqlalchemy import Column, ForeignKey, Index, Integer, String, DateTime, JSON
+from sqlalchemy.orm import deferred, relationship
 from datetime import datetime
+from typing import Any, Dict
 from app.core.database import Base
+from app.models.types import CompressedJSON, CompressedText
+import hashlib
+import json
 import uuid
 
+CONTENT_FIELDS = ("summary", "folder_structure", "tech_stack", "api_endpoints", "readme_content")
+
+def content_digest(fields: Dict[str, Any]) -> str:
+    """Identity of a generated documentation body, used to share one DocumentContent row"""
+    canonical = json.dumps([fields.get(name) for name in CONTENT_FIELDS], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+def _from_content(name: str) -> property:
+    return property(lambda self: getattr(self.content, name) if self.content is not None else None)
+
+# Generated text lives once, compressed, in DocumentContent. Rows are write-once:
+# an upload's Project and Documentation point at the same one, and identical
+# bodies (a re-analysed commit) reuse it.
+class DocumentContent(Base):
+    __tablename__ = "contents"
+
+    id = Column(Integer, primary_key=True)
+    digest = Column(String(64), index=True, nullable=False)
+    summary = Column(CompressedText)
+    folder_structure = Column(CompressedText)
+    tech_stack = Column(CompressedJSON)
+    api_endpoints = Column(CompressedJSON, nullable=True)
+    readme_content = Column(CompressedText)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+# List queries select only what their response schema returns; detail queries
+# load `content` and undefer the assessment group as needed
 class Project(Base):
     __tablename__ = "projects"
+    __table_args__ = (
+        Index("ix_projects_workspace_created", "workspace_id", "created_at", "id"),
+    )
 
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     workspace_id = Column(String, index=True, nullable=False)
@@ -16,24 +51,39 @@ class Project(Base):
     readme_download_count = Column(Integer, default=0)
     dependencies_json = Column(JSON, nullable=True)
     analytics_json = Column(JSON, nullable=True)
-    summary = Column(Text)
-    folder_structure = Column(Text)
-    tech_stack = Column(JSON)
     framework = Column(String, nullable=True)
-    api_endpoints = Column(JSON, nullable=True)
-    readme_content = Column(Text)
+    content_id = Column(Integer, ForeignKey("contents.id"), index=True, nullable=True)
+    repo_url = Column(String, index=True, nullable=True)
+    commit_sha = Column(String, nullable=True)
+    analyzer_version = Column(String, nullable=True)
+    health_json = deferred(Column(JSON, nullable=True), group="assessment")
+    insights_json = deferred(Column(JSON, nullable=True), group="assessment")
+    health_version = Column(String, nullable=True)
+
+    content = relationship(DocumentContent)
+    summary = _from_content("summary")
+    folder_structure = _from_content("folder_structure")
+    tech_stack = _from_content("tech_stack")
+    api_endpoints = _from_content("api_endpoints")
+    readme_content = _from_content("readme_content")
 
 class Documentation(Base):
     __tablename__ = "documentations"
+    __table_args__ = (
+        Index("ix_documentations_workspace_created", "workspace_id", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     workspace_id = Column(String, index=True, nullable=False)
     project_name = Column(String, index=True)
-    summary = Column(Text)
-    folder_structure = Column(Text)
-    tech_stack = Column(JSON)
     detected_language = Column(String)
     framework = Column(String, nullable=True)
-    api_endpoints = Column(JSON, nullable=True)
-    readme_content = Column(Text)
+    content_id = Column(Integer, ForeignKey("contents.id"), index=True, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
+
+    content = relationship(DocumentContent)
+    summary = _from_content("summary")
+    folder_structure = _from_content("folder_structure")
+    tech_stack = _from_content("tech_stack")
+    api_endpoints = _from_content("api_endpoints")
+    readme_content = _from_content("readme_content")
@@ -20,6 +20,11 @@ class ProjectResponse(BaseModel):
     class Config:
         from_attributes = True
 
+class ProjectSearchResult(ProjectResponse):
+    rank: float = 0.0
+    name_highlight: str = ""
+    snippet: str = ""
+
 class ProjectDetailResponse(ProjectResponse):
     summary: str
     folder_structure: str
@@ -27,6 +32,23 @@ class ProjectDetailResponse(ProjectResponse):
     api_endpoints: Optional[List[str]]
     readme_content: str
 
+class DocumentationListItem(BaseModel):
+    """Row of the GET /api/docs/ listing.
+
+    The listing used to return full DocumentationResponse objects. It no longer includes
+    folder_structure, tech_stack, api_endpoints or readme_content; fetch GET /api/docs/{id}
+    for those.
+    """
+    id: int
+    project_name: str
+    summary: str
+    detected_language: str
+    framework: Optional[str]
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
 class DocumentationResponse(BaseModel):
     id: int
     project_name: str
@@ -42,8 +64,13 @@ class DocumentationResponse(BaseModel):
     class Config:
         from_attributes = True
 
-class UploadResponse(BaseModel):
-    message: str
-    doc_id: int
-    project_id: str
-    project_name: str
+class JobResponse(BaseModel):
+    job_id: str
+    status: str
+    project_id: Optional[str] = None
+    doc_id: Optional[int] = None
+    project_name: Optional[str] = None
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
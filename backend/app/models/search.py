@@ -0,0 +1,119 @@
+"""Full-text index over projects, kept in step with the projects table by ORM events.
+
+Each project is one row of the `projects_fts` FTS5 table. Its rowid is derived from
+the project id, so rows can be replaced or removed without a scan. The workspace is
+indexed as a token too, so scoping a search intersects posting lists in the index
+instead of checking every match against the projects table.
+"""
+import hashlib
+import html
+import re
+from typing import Any, Dict, Optional
+from sqlalchemy import event, inspect, text
+from sqlalchemy.engine import Connection
+from app.models.database import Project
+
+FTS_TABLE = "projects_fts"
+
+# Indexed fields in column order, with their bm25 weights
+SEARCH_FIELDS = (
+    ("project_name", 10.0),
+    ("summary", 4.0),
+    ("tech_stack", 3.0),
+    ("api_endpoints", 2.0),
+    ("readme_content", 1.0)
+)
+
+CREATE_FTS_TABLE = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+    "project_id UNINDEXED, "
+    + ", ".join(name for name, _ in SEARCH_FIELDS)
+    + ", workspace, tokenize = 'porter unicode61 remove_diacritics 2')"
+)
+
+BM25 = f"bm25({FTS_TABLE}, 0, {', '.join(str(weight) for _, weight in SEARCH_FIELDS)}, 0)"
+
+# Control characters stand in for the highlight tags until the text is HTML-escaped
+MARK_OPEN, MARK_CLOSE = "\x02", "\x03"
+
+
+def search_rowid(project_id: str) -> int:
+    """Stable positive 63-bit rowid for a project"""
+    digest = hashlib.sha256(project_id.encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") >> 1
+
+
+def workspace_token(workspace_id: str) -> str:
+    """Single index token standing for a workspace"""
+    return "ws" + hashlib.sha256(workspace_id.encode("utf-8")).hexdigest()[:32]
+
+
+def _flatten(value: Any) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, dict):
+        return " ".join(f"{key} {_flatten(item)}" for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return " ".join(_flatten(item) for item in value)
+    return str(value)
+
+
+def index_project(conn: Connection, project_id: str, workspace_id: str, fields: Dict[str, Any]):
+    """Insert or replace the index row of a project"""
+    values = {name: _flatten(fields.get(name)) for name, _ in SEARCH_FIELDS}
+    values["workspace"] = workspace_token(workspace_id)
+    rowid = search_rowid(project_id)
+    conn.execute(text(f"DELETE FROM {FTS_TABLE} WHERE rowid = :rowid"), {"rowid": rowid})
+    conn.execute(
+        text(
+            f"INSERT INTO {FTS_TABLE} (rowid, project_id, {', '.join(values)}) "
+            f"VALUES (:rowid, :project_id, {', '.join(':' + name for name in values)})"
+        ),
+        {"rowid": rowid, "project_id": project_id, **values}
+    )
+
+
+def unindex_project(conn: Connection, project_id: str):
+    conn.execute(text(f"DELETE FROM {FTS_TABLE} WHERE rowid = :rowid"), {"rowid": search_rowid(project_id)})
+
+
+def match_query(search: str, workspace_id: str) -> Optional[str]:
+    """FTS5 query for projects of the workspace containing every word of `search` as a prefix.
+
+    None when `search` has no words.
+    """
+    words = re.findall(r"\w+", search)
+    if not words:
+        return None
+    columns = " ".join(name for name, _ in SEARCH_FIELDS)
+    terms = " ".join(f'"{word}"*' for word in words)
+    return f'workspace : "{workspace_token(workspace_id)}" AND {{{columns}}} : ({terms})'
+
+
+def render_highlight(value: Optional[str]) -> str:
+    """HTML-escape indexed text and turn the match markers into <mark> tags"""
+    escaped = html.escape(value or "")
+    return escaped.replace(MARK_OPEN, "<mark>").replace(MARK_CLOSE, "</mark>")
+
+
+def _project_fields(project: Project) -> Dict[str, Any]:
+    return {name: getattr(project, name) for name, _ in SEARCH_FIELDS}
+
+
+@event.listens_for(Project, "after_insert")
+def _index_inserted(mapper, connection, project: Project):
+    index_project(connection, project.id, project.workspace_id, _project_fields(project))
+
+
+@event.listens_for(Project, "after_update")
+def _index_updated(mapper, connection, project: Project):
+    # Download counts and health refreshes do not touch the indexed text; content rows are
+    # write-once, so the text only changes when the project points at another one
+    state = inspect(project)
+    if any(state.attrs[name].history.has_changes() for name in ("project_name", "content_id", "workspace_id")):
+        index_project(connection, project.id, project.workspace_id, _project_fields(project))
+
+
+@event.listens_for(Project, "after_delete")
+def _unindex_deleted(mapper, connection, project: Project):
+    unindex_project(connection, project.id)
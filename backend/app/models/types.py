@@ -0,0 +1,39 @@
+import json
+import zlib
+from typing import Any, Optional
+from sqlalchemy import LargeBinary
+from sqlalchemy.types import TypeDecorator
+from app.core.config import settings
+
+
+class CompressedText(TypeDecorator):
+    """Text stored as a zlib-compressed UTF-8 blob and read back as str"""
+    impl = LargeBinary
+    cache_ok = True
+
+    def dump(self, value: Any) -> str:
+        return value
+
+    def load(self, value: str) -> Any:
+        return value
+
+    def process_bind_param(self, value: Any, dialect) -> Optional[bytes]:
+        if value is None:
+            return None
+        return zlib.compress(self.dump(value).encode("utf-8"), settings.CONTENT_COMPRESSION_LEVEL)
+
+    def process_result_value(self, value: Optional[bytes], dialect) -> Any:
+        if value is None:
+            return None
+        return self.load(zlib.decompress(value).decode("utf-8"))
+
+
+class CompressedJSON(CompressedText):
+    """JSON document stored the same way as CompressedText"""
+    cache_ok = True
+
+    def dump(self, value: Any) -> str:
+        return json.dumps(value, ensure_ascii=False)
+
+    def load(self, value: str) -> Any:
+        return json.loads(value)
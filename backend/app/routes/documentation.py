@@ -1,55 +1,78 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Query, Response
 from fastapi.responses import FileResponse
-from sqlalchemy.orm import Session
-from app.core.database import get_db
-from app.models.database import Documentation
-from app.models.schemas import DocumentationResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, load_only
+from app.core.database import get_async_db
+from app.core.pagination import NEXT_CURSOR_HEADER, keyset_page, next_cursor
+from app.models.database import DocumentContent, Documentation
+from app.models.schemas import DocumentationListItem, DocumentationResponse
 from app.auth.routes import get_current_user
-from typing import List
+from typing import List, Optional
 import tempfile
 import os
 
 router = APIRouter()
 
+# Listings select only the columns of their response schema; the summary is the one content field
+LIST_COLUMNS = (
+    load_only(
+        Documentation.id, Documentation.project_name, Documentation.detected_language,
+        Documentation.framework, Documentation.created_at
+    ),
+    joinedload(Documentation.content).load_only(DocumentContent.summary)
+)
+
 @router.get("/{doc_id}", response_model=DocumentationResponse)
-def get_documentation(
+async def get_documentation(
     doc_id: int,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     workspace_id = current_user["workspace_id"]
-    doc = db.query(Documentation).filter(
+    doc = await db.scalar(select(Documentation).options(joinedload(Documentation.content)).where(
         Documentation.id == doc_id,
         Documentation.workspace_id == workspace_id
-    ).first()
+    ))
     if not doc:
         raise HTTPException(status_code=404, detail="Documentation not found")
     return doc
 
-@router.get("/", response_model=List[DocumentationResponse])
-def list_documentations(
-    skip: int = 0,
-    limit: int = 10,
+@router.get("/", response_model=List[DocumentationListItem])
+async def list_documentations(
+    response: Response,
+    limit: int = Query(10, ge=1, le=100),
+    cursor: Optional[str] = None,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
+    """Newest documentation first; pass the X-Next-Cursor header back as `cursor` for the next page.
+
+    Items carry only the DocumentationListItem fields; the generated content is on GET /{doc_id}.
+    """
     workspace_id = current_user["workspace_id"]
-    docs = db.query(Documentation).filter(
-        Documentation.workspace_id == workspace_id
-    ).offset(skip).limit(limit).all()
+    query = select(Documentation).options(*LIST_COLUMNS).where(Documentation.workspace_id == workspace_id)
+    docs = list((await db.scalars(keyset_page(query, Documentation, cursor, limit))).all())
+    
+    following = next_cursor(docs, limit)
+    if following:
+        response.headers[NEXT_CURSOR_HEADER] = following
     return docs
 
 @router.get("/{doc_id}/download")
-def download_readme(
+async def download_readme(
     doc_id: int,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     workspace_id = current_user["workspace_id"]
-    doc = db.query(Documentation).filter(
+    doc = await db.scalar(select(Documentation).options(
+        load_only(Documentation.project_name),
+        joinedload(Documentation.content).load_only(DocumentContent.readme_content)
+    ).where(
         Documentation.id == doc_id,
         Documentation.workspace_id == workspace_id
-    ).first()
+    ))
     if not doc:
         raise HTTPException(status_code=404, detail="Documentation not found")
     
@@ -0,0 +1,58 @@
+import json
+from typing import AsyncIterator, Optional
+from fastapi import APIRouter, HTTPException, Depends, Header
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+from app.models.schemas import JobResponse
+from app.services.job_queue import AnalysisJob, job_queue
+from app.auth.routes import get_current_user
+from app.core.config import settings
+
+router = APIRouter()
+
+@router.get("/{job_id}", response_model=JobResponse)
+def get_job(
+    job_id: str,
+    current_user: dict = Depends(get_current_user)
+):
+    return _get_job(job_id, current_user).to_dict()
+
+@router.get("/{job_id}/events")
+async def get_job_events(
+    job_id: str,
+    last_event_id: Optional[str] = Header(None),
+    current_user: dict = Depends(get_current_user)
+):
+    """Server-Sent Events for the stages of a job, ending with its final state"""
+    job = _get_job(job_id, current_user)
+    after = int(last_event_id) if last_event_id and last_event_id.isdigit() else -1
+    
+    return StreamingResponse(
+        _stream_events(job, after),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.post("/{job_id}/cancel", response_model=JobResponse, status_code=202)
+async def cancel_job(
+    job_id: str,
+    current_user: dict = Depends(get_current_user)
+):
+    job = _get_job(job_id, current_user)
+    job_queue.cancel(job)
+    return job.to_dict()
+
+def _get_job(job_id: str, current_user: dict) -> AnalysisJob:
+    job = job_queue.get(job_id, current_user["workspace_id"])
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+async def _stream_events(job: AnalysisJob, after: int) -> AsyncIterator[str]:
+    async for event in job.follow(after, heartbeat=settings.JOB_EVENTS_HEARTBEAT):
+        if event is None:
+            yield ": keepalive\n\n"
+        else:
+            yield f"id: {event['seq']}\nevent: stage\ndata: {json.dumps(event, default=str)}\n\n"
+    
+    yield f"event: job\ndata: {json.dumps(jsonable_encoder(job.to_dict()))}\n\n"
@@ -1,125 +1,200 @@
-from fastapi import APIRouter, HTTPException, Depends, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import desc, asc
-from app.core.database import get_db
-from app.models.database import Project
-from app.models.schemas import ProjectResponse, ProjectDetailResponse
+from fastapi import APIRouter, HTTPException, Depends, Query, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import String, delete, exists, select, text
+from sqlalchemy.orm import joinedload, load_only, undefer
+from app.core.database import get_async_db
+from app.core.pagination import NEXT_CURSOR_HEADER, keyset_page, next_cursor
+from app.models.database import DocumentContent, Documentation, Project
+from app.models.schemas import ProjectResponse, ProjectDetailResponse, ProjectSearchResult
+from app.models.search import BM25, FTS_TABLE, MARK_CLOSE, MARK_OPEN, match_query, render_highlight
 from app.auth.routes import get_current_user
+from app.services.project_export import ProjectExporter
 from typing import List, Optional
 import os
 import shutil
 
 router = APIRouter()
 
+# Listings select only the columns of their response schema
+LIST_COLUMNS = load_only(*(getattr(Project, field) for field in ProjectResponse.model_fields))
+
+async def _get_workspace_project(db: AsyncSession, project_id: str, workspace_id: str, *options) -> Project:
+    """Project of the workspace or 404; `options` load the deferred data the caller reads"""
+    project = await db.scalar(select(Project).options(*options).where(
+        Project.id == project_id,
+        Project.workspace_id == workspace_id
+    ))
+    if not project:
+        raise HTTPException(status_code=404, detail="Project not found")
+    return project
+
 @router.get("/", response_model=List[ProjectResponse])
-def get_projects(
-    skip: int = 0,
-    limit: int = 20,
+async def get_projects(
+    response: Response,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
     language: Optional[str] = None,
     sort_by: str = Query("newest", regex="^(newest|oldest)$"),
     search: Optional[str] = None,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
+    """List workspace projects a page at a time; pass the X-Next-Cursor header back as `cursor`"""
     workspace_id = current_user["workspace_id"]
-    query = db.query(Project).filter(Project.workspace_id == workspace_id)
+    query = select(Project).options(LIST_COLUMNS).where(Project.workspace_id == workspace_id)
     
     if language:
-        query = query.filter(Project.primary_language == language)
+        query = query.where(Project.primary_language == language)
     
-    if search:
-        query = query.filter(Project.project_name.contains(search))
+    match = match_query(search, workspace_id) if search else None
+    if match:
+        matches = text(f"SELECT project_id FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH :match")
+        query = query.where(Project.id.in_(matches.bindparams(match=match).columns(project_id=String)))
     
-    if sort_by == "newest":
-        query = query.order_by(desc(Project.created_at))
-    else:
-        query = query.order_by(asc(Project.created_at))
+    query = keyset_page(query, Project, cursor, limit, newest_first=sort_by == "newest")
+    projects = list((await db.scalars(query)).all())
     
-    projects = query.offset(skip).limit(limit).all()
+    following = next_cursor(projects, limit)
+    if following:
+        response.headers[NEXT_CURSOR_HEADER] = following
     return projects
 
+@router.get("/search", response_model=List[ProjectSearchResult])
+async def search_projects(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=50),
+    current_user: dict = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Best matches in the workspace for `q` across names, summaries, stack, endpoints and READMEs"""
+    match = match_query(q, current_user["workspace_id"])
+    if not match:
+        return []
+    
+    hits = (await db.execute(
+        text(
+            f"SELECT f.project_id, {BM25} AS rank, "
+            f"highlight({FTS_TABLE}, 1, :open, :close) AS name_highlight, "
+            f"snippet({FTS_TABLE}, -1, :open, :close, '…', 24) AS snippet "
+            f"FROM {FTS_TABLE} f WHERE {FTS_TABLE} MATCH :match "
+            f"ORDER BY rank LIMIT :limit"
+        ),
+        {"match": match, "limit": limit, "open": MARK_OPEN, "close": MARK_CLOSE}
+    )).all()
+    
+    projects = {
+        project.id: project
+        for project in await db.scalars(select(Project).options(LIST_COLUMNS).where(
+            Project.id.in_([hit.project_id for hit in hits]),
+            Project.workspace_id == current_user["workspace_id"]
+        ))
+    }
+    return [
+        ProjectSearchResult.model_validate(projects[hit.project_id]).model_copy(update={
+            "rank": -hit.rank,
+            "name_highlight": render_highlight(hit.name_highlight),
+            "snippet": render_highlight(hit.snippet)
+        })
+        for hit in hits if hit.project_id in projects
+    ]
+
+@router.get("/export")
+async def export_projects(
+    format: str = Query("ndjson", regex="^(ndjson|tar)$"),
+    current_user: dict = Depends(get_current_user)
+):
+    """Stream every workspace project as NDJSON, or their READMEs as a gzipped tar"""
+    workspace_id = current_user["workspace_id"]
+    if format == "tar":
+        return StreamingResponse(
+            ProjectExporter.readme_tar(workspace_id),
+            media_type="application/gzip",
+            headers={"Content-Disposition": 'attachment; filename="projects.tar.gz"'}
+        )
+    return StreamingResponse(
+        ProjectExporter.ndjson(workspace_id),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": 'attachment; filename="projects.ndjson"'}
+    )
+
 @router.get("/user/me", response_model=List[ProjectResponse])
-def get_user_projects(
+async def get_user_projects(
+    response: Response,
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = None,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
+    """Newest workspace projects, a bounded page at a time; use /export for the whole workspace"""
     workspace_id = current_user["workspace_id"]
-    projects = db.query(Project).filter(Project.workspace_id == workspace_id).order_by(desc(Project.created_at)).all()
+    query = select(Project).options(LIST_COLUMNS).where(Project.workspace_id == workspace_id)
+    projects = list((await db.scalars(keyset_page(query, Project, cursor, limit))).all())
+    
+    following = next_cursor(projects, limit)
+    if following:
+        response.headers[NEXT_CURSOR_HEADER] = following
     return projects
 
 @router.get("/{project_id}", response_model=ProjectDetailResponse)
-def get_project(
+async def get_project(
     project_id: str,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    workspace_id = current_user["workspace_id"]
-    project = db.query(Project).filter(
-        Project.id == project_id,
-        Project.workspace_id == workspace_id
-    ).first()
-    if not project:
-        raise HTTPException(status_code=404, detail="Project not found")
+    project = await _get_workspace_project(db, project_id, current_user["workspace_id"], joinedload(Project.content))
     return project
 
 @router.delete("/{project_id}")
-def delete_project(
+async def delete_project(
     project_id: str,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    workspace_id = current_user["workspace_id"]
-    project = db.query(Project).filter(
-        Project.id == project_id,
-        Project.workspace_id == workspace_id
-    ).first()
-    if not project:
-        raise HTTPException(status_code=404, detail="Project not found")
+    project = await _get_workspace_project(db, project_id, current_user["workspace_id"])
     
     # Delete related files if they exist
     from app.core.config import settings
     project_path = os.path.join(settings.UPLOAD_DIR, project_id)
     if os.path.exists(project_path):
         try:
-            shutil.rmtree(project_path)
+            await run_in_threadpool(shutil.rmtree, project_path)
         except Exception as e:
             print(f"Error deleting files: {e}")
     
-    db.delete(project)
-    db.commit()
+    content_id = project.content_id
+    await db.delete(project)
+    await db.flush()
+    
+    # Content is shared with the upload's documentation and identical re-uploads
+    await db.execute(delete(DocumentContent).where(
+        DocumentContent.id == content_id,
+        ~exists().where(Project.content_id == content_id),
+        ~exists().where(Documentation.content_id == content_id)
+    ))
+    await db.commit()
     return {"message": "Project deleted successfully"}
 
 @router.post("/{project_id}/download")
-def increment_download(
+async def increment_download(
     project_id: str,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    workspace_id = current_user["workspace_id"]
-    project = db.query(Project).filter(
-        Project.id == project_id,
-        Project.workspace_id == workspace_id
-    ).first()
-    if not project:
-        raise HTTPException(status_code=404, detail="Project not found")
+    project = await _get_workspace_project(db, project_id, current_user["workspace_id"])
     
     project.readme_download_count += 1
-    db.commit()
+    await db.commit()
     return {"download_count": project.readme_download_count}
 
 @router.get("/{project_id}/dependencies")
-def get_project_dependencies(
+async def get_project_dependencies(
     project_id: str,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    workspace_id = current_user["workspace_id"]
-    project = db.query(Project).filter(
-        Project.id == project_id,
-        Project.workspace_id == workspace_id
-    ).first()
-    if not project:
-        raise HTTPException(status_code=404, detail="Project not found")
+    project = await _get_workspace_project(db, project_id, current_user["workspace_id"])
     
     if project.dependencies_json:
         return project.dependencies_json
@@ -135,58 +210,33 @@ def get_project_dependencies(
     }
 
 @router.get("/{project_id}/health")
-def get_project_health(
+async def get_project_health(
     project_id: str,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    workspace_id = current_user["workspace_id"]
-    project = db.query(Project).filter(
-        Project.id == project_id,
-        Project.workspace_id == workspace_id
-    ).first()
-    if not project:
-        raise HTTPException(status_code=404, detail="Project not found")
+    project = await _get_workspace_project(db, project_id, current_user["workspace_id"], undefer(Project.health_json))
     
-    from app.core.config import settings
-    from app.services.health_score import HealthScoreCalculator
-    project_path = os.path.join(settings.UPLOAD_DIR, project_id)
-    
-    if os.path.exists(project_path):
-        health = HealthScoreCalculator.calculate_health(project_path)
-        return health
+    if project.health_json:
+        return {**project.health_json, "analyzer_version": project.health_version}
     
     return {
         "score": 50,
         "grade": "D",
-        "issues": ["Project files not accessible"]
+        "issues": ["Health score not computed for this project"],
+        "analyzer_version": project.health_version
     }
 
 @router.get("/{project_id}/insights")
-def get_project_insights(
+async def get_project_insights(
     project_id: str,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    workspace_id = current_user["workspace_id"]
-    project = db.query(Project).filter(
-        Project.id == project_id,
-        Project.workspace_id == workspace_id
-    ).first()
-    if not project:
-        raise HTTPException(status_code=404, detail="Project not found")
+    project = await _get_workspace_project(db, project_id, current_user["workspace_id"], undefer(Project.insights_json))
     
-    dependencies = project.dependencies_json or {}
-    
-    from app.core.config import settings
-    from app.services.health_score import HealthScoreCalculator
-    from app.services.insights_engine import InsightsEngine
-    project_path = os.path.join(settings.UPLOAD_DIR, project_id)
-    
-    if os.path.exists(project_path):
-        health = HealthScoreCalculator.calculate_health(project_path)
-        insights = InsightsEngine.generate_insights(project_path, dependencies, health)
-        return {"insights": insights}
+    if project.insights_json is not None:
+        return {"insights": project.insights_json, "analyzer_version": project.health_version}
     
     return {
         "insights": [
@@ -196,5 +246,45 @@ def get_project_insights(
                 "message": "Project analysis available after upload",
                 "severity": "info"
             }
-        ]
+        ],
+        "analyzer_version": project.health_version
+    }
+
+@router.post("/{project_id}/recompute")
+async def recompute_project_health(
+    project_id: str,
+    current_user: dict = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Recompute stored health and insights from the project's repository mirror"""
+    project = await _get_workspace_project(db, project_id, current_user["workspace_id"])
+    if not project.repo_url or not project.commit_sha:
+        raise HTTPException(status_code=409, detail="Project source is not retained; upload it again to refresh")
+    
+    from app.core.workers import worker_pools
+    from app.services.github_service import GitHubService
+    from app.services.pipeline import assess_git_checkout
+    from app.services.analyzer import ANALYZER_VERSION
+    
+    mirror = GitHubService.mirror_path(project.repo_url)
+    if not os.path.isdir(mirror):
+        mirror, _ = await GitHubService.fetch_repository(project.repo_url)
+    
+    checkout_path = await GitHubService.checkout_repository(mirror, project.commit_sha)
+    try:
+        assessment = await worker_pools.run_in_process(
+            assess_git_checkout, checkout_path, project.dependencies_json or {}
+        )
+    finally:
+        await GitHubService.remove_checkout(mirror, checkout_path)
+    
+    project.health_json = assessment["health"]
+    project.insights_json = assessment["insights"]
+    project.health_version = ANALYZER_VERSION
+    await db.commit()
+    
+    return {
+        "health": project.health_json,
+        "insights": project.insights_json,
+        "analyzer_version": project.health_version
     }
@@ -1,59 +1,219 @@
-from fastapi import APIRouter, UploadFile, File, HTTPException, Depends
-from app.services.summarization_engine import summarize_document
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import uuid
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Depends
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
+from app.services.summarization_engine import summarize_chunks
+from app.services.pdf_extractor import PDFExtractor
+from app.services.summary_cache import summary_cache
+from app.services.file_handler import CHUNK_SIZE, FileHandler
 from app.auth.routes import get_current_user
-import PyPDF2
+from app.core.config import settings
+from app.core.workers import worker_pools
 import docx
 import io
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 
+SOURCE_TYPES = {"auto", "email", "technical", "business", "documentation", "mixed"}
+
 @router.post("/summarize")
 async def summarize_file(
     file: UploadFile = File(...),
+    source_type: str = Form("auto"),
     current_user: dict = Depends(get_current_user)
 ):
     """Summarize uploaded document (PDF, DOCX, TXT)"""
     
+    _check_source_type(source_type)
+    
     try:
-        # Extract text based on file type
         content = await file.read()
-        
-        if file.filename.endswith('.pdf'):
-            text = extract_pdf_text(content)
-        elif file.filename.endswith('.docx'):
-            text = extract_docx_text(content)
-        elif file.filename.endswith('.txt'):
-            text = content.decode('utf-8', errors='ignore')
-        else:
-            raise HTTPException(status_code=400, detail="Unsupported file type. Use PDF, DOCX, or TXT")
-        
-        if not text or len(text.strip()) < 50:
-            raise HTTPException(status_code=400, detail="Document contains insufficient text for summarization")
-        
-        # Generate summary
-        summary = summarize_document(text)
+        result = await summarize_upload(file.filename, content, source_type, current_user["workspace_id"])
         
         return {
             "filename": file.filename,
-            "summary": summary,
+            **result,
             "workspace_id": current_user["workspace_id"]
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Summarization failed: {str(e)}")
 
 
-def extract_pdf_text(content: bytes) -> str:
-    """Extract text from PDF"""
+@router.post("/batch")
+async def summarize_batch(
+    files: List[UploadFile] = File(...),
+    source_type: str = Form("auto"),
+    current_user: dict = Depends(get_current_user)
+):
+    """Summarize several documents concurrently, streaming one NDJSON line per file as it finishes"""
+    
+    _check_source_type(source_type)
+    if len(files) > settings.SUMMARY_BATCH_MAX_FILES:
+        raise HTTPException(status_code=400, detail=f"Too many files. Send at most {settings.SUMMARY_BATCH_MAX_FILES}")
+    
+    # Copy the uploads out now: they are closed once this handler returns
+    uploads = []
     try:
-        pdf_file = io.BytesIO(content)
-        pdf_reader = PyPDF2.PdfReader(pdf_file)
-        text = ""
-        for page in pdf_reader.pages:
-            text += page.extract_text() + "\n"
-        return text
-    except Exception as e:
-        raise HTTPException(status_code=400, detail=f"Failed to extract PDF text: {str(e)}")
+        for file in files:
+            uploads.append((file.filename, await _spool_batch_file(file)))
+    except BaseException:
+        _remove_spooled(uploads)
+        raise
+    
+    return StreamingResponse(
+        _stream_batch(uploads, source_type, current_user["workspace_id"]),
+        media_type="application/x-ndjson",
+        background=BackgroundTask(_remove_spooled, uploads)
+    )
+
+
+@router.get("/cache/stats")
+def get_cache_stats(current_user: dict = Depends(get_current_user)):
+    """The caller's workspace hit rate, plus the size of the cache all workspaces share"""
+    return {**summary_cache.workspace_stats(current_user["workspace_id"]), "shared": summary_cache.stats()}
+
+
+def _check_source_type(source_type: str):
+    if source_type not in SOURCE_TYPES:
+        raise HTTPException(status_code=400, detail=f"Unknown source_type. Use one of: {', '.join(sorted(SOURCE_TYPES))}")
+
+
+async def _spool_batch_file(file: UploadFile) -> Optional[str]:
+    """Copy one batch upload under UPLOAD_DIR in fixed-size chunks.
+
+    Returns the copy's path, or None if the file is over SUMMARY_BATCH_MAX_FILE_BYTES.
+    """
+    limit = settings.SUMMARY_BATCH_MAX_FILE_BYTES
+    if file.size and file.size > limit:
+        return None
+    
+    os.makedirs(settings.UPLOAD_DIR, exist_ok=True)
+    path = os.path.join(settings.UPLOAD_DIR, f"{uuid.uuid4()}.batch")
+    total = 0
+    try:
+        with open(path, "wb") as buffer:
+            while True:
+                chunk = await file.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                total += len(chunk)
+                if total > limit:
+                    break
+                buffer.write(chunk)
+    except BaseException:
+        FileHandler.cleanup_file(path)
+        raise
+    
+    if total > limit:
+        FileHandler.cleanup_file(path)
+        return None
+    return path
+
+
+def _remove_spooled(uploads: List[Tuple[str, Optional[str]]]):
+    for _, path in uploads:
+        if path is not None:
+            FileHandler.cleanup_file(path)
+
+
+def _read_file(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
+
+
+async def _stream_batch(uploads: List[Tuple[str, Optional[str]]], source_type: str, workspace_id: str) -> AsyncIterator[str]:
+    slots = asyncio.Semaphore(settings.SUMMARY_BATCH_CONCURRENCY)
+    
+    async def summarize_one(index: int, filename: str, path: Optional[str]) -> Dict:
+        line = {"index": index, "filename": filename, "workspace_id": workspace_id}
+        if path is None:
+            return {**line, "status": "failed", "error": "File too large"}
+        
+        # Only files holding a slot are in memory
+        async with slots:
+            try:
+                content = await run_in_threadpool(_read_file, path)
+                result = await summarize_upload(filename, content, source_type, workspace_id)
+                return {**line, "status": "done", **result}
+            except HTTPException as e:
+                return {**line, "status": "failed", "error": e.detail}
+            except Exception as e:
+                logger.error(f"Summarization of {filename} failed: {str(e)}")
+                return {**line, "status": "failed", "error": f"Summarization failed: {str(e)}"}
+    
+    tasks = [asyncio.create_task(summarize_one(i, name, path)) for i, (name, path) in enumerate(uploads)]
+    try:
+        for finished in asyncio.as_completed(tasks):
+            yield json.dumps(await finished, default=str) + "\n"
+    finally:
+        # The client went away or the stream ended; stop whatever is still queued
+        for task in tasks:
+            task.cancel()
+
+
+async def summarize_upload(filename: str, content: bytes, source_type: str, workspace_id: str) -> Dict:
+    """Summary and page counts for an upload, served from the cache when possible"""
+    digest = await run_in_threadpool(lambda: hashlib.sha256(content).hexdigest())
+    document_key = summary_cache.document_key(digest, filename)
+    summary_key = summary_cache.summary_key(document_key, source_type)
+    
+    cached = await run_in_threadpool(summary_cache.get, summary_key)
+    summary_cache.record_lookup(workspace_id, cached is not None)
+    if cached is not None:
+        return cached
+    
+    text_key = summary_cache.text_key(document_key)
+    extracted = await run_in_threadpool(summary_cache.get, text_key)
+    if extracted is not None:
+        chunks, pages = extracted["chunks"], extracted["pages"]
+        complete = True
+    else:
+        chunks, pages = await extract_chunks(filename, content)
+        # A PDF cut short by the time budget may extract further next time
+        complete = pages is None or pages["summarized"] >= min(pages["total"], settings.PDF_MAX_PAGES)
+        if complete:
+            await run_in_threadpool(summary_cache.put, text_key, {"chunks": chunks, "pages": pages})
+    
+    if sum(len(chunk.strip()) for chunk in chunks) < 50:
+        raise HTTPException(status_code=400, detail="Document contains insufficient text for summarization")
+    
+    # Generate summary, block by block on the summary worker processes
+    summary = await run_in_threadpool(
+        summarize_chunks, chunks, source_type, worker_pools.get_summary_pool()
+    )
+    
+    result = {"summary": summary, "pages": pages}
+    if complete:
+        await run_in_threadpool(summary_cache.put, summary_key, result)
+    return result
+
+
+async def extract_chunks(filename: str, content: bytes) -> Tuple[List[str], Optional[Dict]]:
+    """Text of an upload as pieces to summarize, plus page counts for PDFs"""
+    if filename.endswith('.pdf'):
+        chunks, page_count = await PDFExtractor.extract_pages(
+            content,
+            progress=lambda done, total: logger.info(f"Extracted {done}/{total} pages of {filename}")
+        )
+        return chunks, {"summarized": len(chunks), "total": page_count}
+    elif filename.endswith('.docx'):
+        return [await run_in_threadpool(extract_docx_text, content)], None
+    elif filename.endswith('.txt'):
+        return [content.decode('utf-8', errors='ignore')], None
+    else:
+        raise HTTPException(status_code=400, detail="Unsupported file type. Use PDF, DOCX, or TXT")
 
 
 def extract_docx_text(content: bytes) -> str:
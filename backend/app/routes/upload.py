@@ -1,145 +1,102 @@
 from fastapi import APIRouter, UploadFile, File, HTTPException, Depends
-from sqlalchemy.orm import Session
-from app.core.database import get_db
-from app.models.schemas import GitHubRepoRequest, UploadResponse
+from fastapi.concurrency import run_in_threadpool
+from app.models.schemas import GitHubRepoRequest, JobResponse
 from app.services.file_handler import FileHandler
 from app.services.github_service import GitHubService
-from app.services.analyzer import CodeAnalyzer
-from app.services.doc_generator import DocumentationGenerator
-from app.services.dependency_detector import DependencyDetector
-from app.models.database import Documentation, Project
+from app.services.pipeline import analyze_git_checkout, analyze_zip, find_previous_analysis, plan_carry_forward
+from app.services.analysis_cache import analysis_cache
+from app.services.job_queue import job_queue
+from app.core.progress import StageReporter
+from app.core.workers import worker_pools
 from app.auth.routes import get_current_user
 import logging
-import os
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
-def count_files(path: str) -> int:
-    count = 0
-    for root, dirs, files in os.walk(path):
-        count += len(files)
-    return count
-
-@router.post("/zip", response_model=UploadResponse)
+@router.post("/zip", response_model=JobResponse, status_code=202)
 async def upload_zip(
     file: UploadFile = File(...),
-    current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: dict = Depends(get_current_user)
 ):
     if not file.filename.endswith('.zip'):
         raise HTTPException(status_code=400, detail="Only ZIP files are allowed")
     
-    workspace_id = current_user["workspace_id"]
+    zip_path, digest = await FileHandler.save_zip_upload(file)
+    cache_key = analysis_cache.archive_key(digest)
     
-    try:
-        extract_path = await FileHandler.handle_zip_upload(file)
-        analysis = CodeAnalyzer.analyze_project(extract_path)
-        readme = DocumentationGenerator.generate_readme(analysis)
-        dependencies = DependencyDetector.detect_dependencies(extract_path)
-        file_count = count_files(extract_path)
-        
-        doc = Documentation(
-            workspace_id=workspace_id,
-            project_name=analysis['project_name'],
-            summary=analysis['summary'],
-            folder_structure=analysis['folder_structure'],
-            tech_stack=analysis['tech_stack'],
-            detected_language=analysis['detected_language'],
-            framework=analysis.get('framework'),
-            api_endpoints=analysis.get('api_endpoints'),
-            readme_content=readme
-        )
-        db.add(doc)
-        db.flush()
-        
-        project = Project(
-            workspace_id=workspace_id,
-            user_id=current_user["id"],
-            project_name=analysis['project_name'],
-            primary_language=analysis['detected_language'],
-            file_count=file_count,
-            readme_download_count=0,
-            dependencies_json=dependencies,
-            analytics_json={"file_count": file_count, "language": analysis['detected_language']},
-            summary=analysis['summary'],
-            folder_structure=analysis['folder_structure'],
-            tech_stack=analysis['tech_stack'],
-            framework=analysis.get('framework'),
-            api_endpoints=analysis.get('api_endpoints'),
-            readme_content=readme
-        )
-        db.add(project)
-        db.commit()
-        db.refresh(doc)
-        db.refresh(project)
+    async def work(reporter: StageReporter):
+        with reporter.stage("cache") as details:
+            cached = analysis_cache.get(cache_key)
+            details["hit"] = cached is not None
+        if cached is not None:
+            return cached
         
-        return UploadResponse(
-            message="Project analyzed successfully",
-            doc_id=doc.id,
-            project_id=project.id,
-            project_name=doc.project_name
+        async with reporter.in_worker() as worker_reporter:
+            result = await worker_pools.run_in_process(analyze_zip, zip_path, worker_reporter)
+        analysis_cache.put(cache_key, result)
+        return result
+    
+    try:
+        job = job_queue.submit(
+            current_user["workspace_id"], current_user["id"], work,
+            cleanup=lambda: FileHandler.cleanup_file(zip_path)
         )
-    except Exception as e:
-        logger.error(f"Upload error: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+    except HTTPException:
+        # A full queue rejects the job before its cleanup is registered
+        FileHandler.cleanup_file(zip_path)
+        raise
+    return job.to_dict()
+
+async def analyze_github(repo_url: str, workspace_id: str, reporter: StageReporter) -> dict:
+    """Update the repo mirror and analyze HEAD, reusing unaffected earlier results"""
+    with reporter.stage("fetch") as details:
+        mirror, commit_sha = await GitHubService.fetch_repository(repo_url)
+        details["commit_sha"] = commit_sha
+    
+    cache_key = analysis_cache.commit_key(repo_url, commit_sha)
+    with reporter.stage("cache") as details:
+        cached = analysis_cache.get(cache_key)
+        details["hit"] = cached is not None
+    if cached is not None:
+        return cached
+    
+    with reporter.stage("plan") as details:
+        carried = {}
+        previous = await run_in_threadpool(find_previous_analysis, workspace_id, repo_url)
+        if previous:
+            changed_paths = await GitHubService.changed_files(mirror, previous["commit_sha"], commit_sha)
+            if changed_paths is not None:
+                carried = plan_carry_forward(previous, changed_paths)
+                details["changed_files"] = len(changed_paths)
+        details["reused"] = sorted(carried)
+    
+    with reporter.stage("checkout"):
+        checkout_path = await GitHubService.checkout_repository(mirror, commit_sha)
+    try:
+        async with reporter.in_worker() as worker_reporter:
+            result = await worker_pools.run_in_process(analyze_git_checkout, checkout_path, carried, worker_reporter)
+    finally:
+        await GitHubService.remove_checkout(mirror, checkout_path)
+    
+    result = {**result, "repo_url": repo_url, "commit_sha": commit_sha}
+    analysis_cache.put(cache_key, result)
+    return result
 
-@router.post("/github", response_model=UploadResponse)
+@router.post("/github", response_model=JobResponse, status_code=202)
 async def upload_github(
     request: GitHubRepoRequest,
-    current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: dict = Depends(get_current_user)
 ):
+    repo_url = str(request.repo_url)
     workspace_id = current_user["workspace_id"]
     
-    try:
-        clone_path = await GitHubService.clone_repository(str(request.repo_url))
-        analysis = CodeAnalyzer.analyze_project(clone_path)
-        readme = DocumentationGenerator.generate_readme(analysis)
-        dependencies = DependencyDetector.detect_dependencies(clone_path)
-        file_count = count_files(clone_path)
-        
-        doc = Documentation(
-            workspace_id=workspace_id,
-            project_name=analysis['project_name'],
-            summary=analysis['summary'],
-            folder_structure=analysis['folder_structure'],
-            tech_stack=analysis['tech_stack'],
-            detected_language=analysis['detected_language'],
-            framework=analysis.get('framework'),
-            api_endpoints=analysis.get('api_endpoints'),
-            readme_content=readme
-        )
-        db.add(doc)
-        db.flush()
-        
-        project = Project(
-            workspace_id=workspace_id,
-            user_id=current_user["id"],
-            project_name=analysis['project_name'],
-            primary_language=analysis['detected_language'],
-            file_count=file_count,
-            readme_download_count=0,
-            dependencies_json=dependencies,
-            analytics_json={"file_count": file_count, "language": analysis['detected_language']},
-            summary=analysis['summary'],
-            folder_structure=analysis['folder_structure'],
-            tech_stack=analysis['tech_stack'],
-            framework=analysis.get('framework'),
-            api_endpoints=analysis.get('api_endpoints'),
-            readme_content=readme
-        )
-        db.add(project)
-        db.commit()
-        db.refresh(doc)
-        db.refresh(project)
-        
-        return UploadResponse(
-            message="GitHub repository analyzed successfully",
-            doc_id=doc.id,
-            project_id=project.id,
-            project_name=doc.project_name
-        )
-    except Exception as e:
-        logger.error(f"GitHub upload error: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+    async def work(reporter: StageReporter):
+        return await analyze_github(repo_url, workspace_id, reporter)
+    
+    job = job_queue.submit(workspace_id, current_user["id"], work)
+    return job.to_dict()
+
+@router.get("/cache/stats")
+def get_cache_stats(current_user: dict = Depends(get_current_user)):
+    return analysis_cache.stats()
@@ -0,0 +1,35 @@
+import json
+from typing import Dict, Optional
+from app.core.cache import LRUCache
+from app.core.config import settings
+from app.services.analyzer import ANALYZER_VERSION
+
+class AnalysisCache:
+    """Pipeline results keyed by archive digest or commit SHA plus analyzer version"""
+    
+    def __init__(self):
+        self.cache = LRUCache(
+            max_entries=settings.ANALYSIS_CACHE_MAX_ENTRIES,
+            max_bytes=settings.ANALYSIS_CACHE_MAX_BYTES,
+            size_of=lambda result: len(json.dumps(result, default=str))
+        )
+    
+    @staticmethod
+    def archive_key(digest: str) -> str:
+        return f"zip:{digest}:{ANALYZER_VERSION}"
+    
+    @staticmethod
+    def commit_key(repo_url: str, commit_sha: str) -> str:
+        return f"git:{repo_url.rstrip('/').lower()}@{commit_sha}:{ANALYZER_VERSION}"
+    
+    def get(self, key: str) -> Optional[Dict]:
+        return self.cache.get(key)
+    
+    def put(self, key: str, result: Dict):
+        self.cache.put(key, result)
+    
+    def stats(self) -> Dict:
+        return self.cache.stats()
+
+
+analysis_cache = AnalysisCache()
@@ -1,22 +1,29 @@
-import os
 from typing import Dict, List, Optional
-from collections import Counter
+from app.services.repo_scanner import RepoManifest
 from app.utils.language_detector import LanguageDetector
 from app.utils.framework_detector import FrameworkDetector
 from app.utils.api_detector import APIDetector
 
+# Bump whenever analyzer output changes so cached and stored results are recomputed
+ANALYZER_VERSION = "3"
+
 class CodeAnalyzer:
     @staticmethod
-    def analyze_project(project_path: str) -> Dict:
-        project_name = os.path.basename(project_path)
+    def analyze_project(manifest: RepoManifest, carried: Optional[Dict] = None) -> Dict:
+        """Analyze a project; results present in `carried` are reused instead of re-detected"""
+        carried = carried or {}
+        project_name = manifest.name
         
-        files = CodeAnalyzer._get_all_files(project_path)
-        folder_structure = CodeAnalyzer._generate_folder_structure(project_path)
+        files = manifest.files
+        folder_structure = CodeAnalyzer._generate_folder_structure(manifest)
         
-        detected_language = LanguageDetector.detect_primary_language(files)
-        tech_stack = CodeAnalyzer._detect_tech_stack(project_path, files)
-        framework = FrameworkDetector.detect_framework(project_path, files, detected_language)
-        api_endpoints = APIDetector.detect_api_endpoints(project_path, files)
+        detected_language = LanguageDetector.detect_primary_language(manifest)
+        tech_stack = CodeAnalyzer._detect_tech_stack(files)
+        framework = FrameworkDetector.detect_framework(manifest, detected_language)
+        if 'api_endpoints' in carried:
+            api_endpoints = carried['api_endpoints']
+        else:
+            api_endpoints = APIDetector.detect_api_endpoints(manifest)
         
         summary = CodeAnalyzer._generate_summary(
             project_name, detected_language, framework, len(files)
@@ -31,53 +38,34 @@ class CodeAnalyzer:
             'framework': framework,
             'api_endpoints': api_endpoints
         }
-    
-    @staticmethod
-    def _get_all_files(path: str) -> List[str]:
-        files = []
-        exclude_dirs = {'.git', 'node_modules', '__pycache__', 'venv', 'env', 'dist', 'build', '.next'}
-        
-        for root, dirs, filenames in os.walk(path):
-            dirs[:] = [d for d in dirs if d not in exclude_dirs]
-            for filename in filenames:
-                files.append(os.path.join(root, filename))
-        
-        return files
 
     @staticmethod
-    def _generate_folder_structure(path: str, prefix: str = "", max_depth: int = 3, current_depth: int = 0) -> str:
+    def _generate_folder_structure(manifest: RepoManifest, rel_dir: str = "", prefix: str = "", max_depth: int = 3, current_depth: int = 0) -> str:
         if current_depth >= max_depth:
             return ""
         
         structure = []
-        exclude_dirs = {'.git', 'node_modules', '__pycache__', 'venv', 'env', 'dist', 'build', '.next'}
+        dirs, files = manifest.list_dir(rel_dir)
         
-        try:
-            items = sorted(os.listdir(path))
-            dirs = [item for item in items if os.path.isdir(os.path.join(path, item)) and item not in exclude_dirs]
-            files = [item for item in items if os.path.isfile(os.path.join(path, item))]
-            
-            for directory in dirs[:10]:
-                structure.append(f"{prefix}├── {directory}/")
-                sub_structure = CodeAnalyzer._generate_folder_structure(
-                    os.path.join(path, directory),
-                    prefix + "│   ",
-                    max_depth,
-                    current_depth + 1
-                )
-                if sub_structure:
-                    structure.append(sub_structure)
-            
-            for file in files[:15]:
-                structure.append(f"{prefix}├── {file}")
+        for directory in dirs[:10]:
+            structure.append(f"{prefix}├── {directory}/")
+            sub_structure = CodeAnalyzer._generate_folder_structure(
+                manifest,
+                f"{rel_dir}/{directory}" if rel_dir else directory,
+                prefix + "│   ",
+                max_depth,
+                current_depth + 1
+            )
+            if sub_structure:
+                structure.append(sub_structure)
         
-        except PermissionError:
-            pass
+        for file in files[:15]:
+            structure.append(f"{prefix}├── {file}")
         
         return "\n".join(structure)
     
     @staticmethod
-    def _detect_tech_stack(project_path: str, files: List[str]) -> Dict[str, str]:
+    def _detect_tech_stack(files: List[str]) -> Dict[str, str]:
         tech_stack = {}
         
         if any('package.json' in f for f in files):
@@ -1,13 +1,18 @@
 import os
 import zipfile
 import shutil
+import hashlib
+from typing import Tuple
 from fastapi import UploadFile, HTTPException
 from app.core.config import settings
 import uuid
 
+CHUNK_SIZE = 1024 * 1024
+
 class FileHandler:
     @staticmethod
-    async def handle_zip_upload(file: UploadFile) -> str:
+    async def save_zip_upload(file: UploadFile) -> Tuple[str, str]:
+        """Store the upload under UPLOAD_DIR and return (path, sha256 digest)"""
         if file.size and file.size > settings.MAX_FILE_SIZE:
             raise HTTPException(status_code=400, detail="File too large")
         
@@ -15,23 +20,47 @@ class FileHandler:
         
         unique_id = str(uuid.uuid4())
         zip_path = os.path.join(settings.UPLOAD_DIR, f"{unique_id}.zip")
-        extract_path = os.path.join(settings.UPLOAD_DIR, unique_id)
         
-        with open(zip_path, "wb") as buffer:
-            content = await file.read()
-            buffer.write(content)
+        digest = await FileHandler._stream_to_disk(file, zip_path)
         
-        try:
-            with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-                zip_ref.extractall(extract_path)
-        except zipfile.BadZipFile:
-            raise HTTPException(status_code=400, detail="Invalid ZIP file")
-        finally:
+        if not zipfile.is_zipfile(zip_path):
             os.remove(zip_path)
+            raise HTTPException(status_code=400, detail="Invalid ZIP file")
         
-        return extract_path
+        return zip_path, digest
+    
+    @staticmethod
+    async def _stream_to_disk(file: UploadFile, dest_path: str) -> str:
+        """Copy the upload in fixed-size chunks, enforcing the size limit as we go.
+
+        The server has already spooled the whole request body by the time this runs;
+        the limit bounds what is kept under UPLOAD_DIR, not what was received.
+        """
+        total = 0
+        sha256 = hashlib.sha256()
+        try:
+            with open(dest_path, "wb") as buffer:
+                while True:
+                    chunk = await file.read(CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    total += len(chunk)
+                    if total > settings.MAX_FILE_SIZE:
+                        raise HTTPException(status_code=400, detail="File too large")
+                    sha256.update(chunk)
+                    buffer.write(chunk)
+        except BaseException:
+            if os.path.exists(dest_path):
+                os.remove(dest_path)
+            raise
+        return sha256.hexdigest()
     
     @staticmethod
     def cleanup_directory(path: str):
         if os.path.exists(path):
             shutil.rmtree(path)
+    
+    @staticmethod
+    def cleanup_file(path: str):
+        if os.path.exists(path):
+            os.remove(path)
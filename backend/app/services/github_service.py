@@ -1,36 +1,188 @@
 import os
-import subprocess
+import asyncio
+import hashlib
+import shutil
+import weakref
+from typing import List, Optional, Tuple
 from fastapi import HTTPException
 from app.core.config import settings
+from app.services.repo_scanner import EXCLUDE_DIRS
 import uuid
 import re
 
+# Files the detectors read; everything else is listed from the tree but never downloaded
+SPARSE_PATTERNS = [
+    "/package.json",
+    "/requirements.txt",
+    "/pyproject.toml",
+    "*.py",
+    "*.js",
+    "*.ts",
+    "*.java",
+    "*.xml",
+] + [f"!**/{directory}/**" for directory in sorted(EXCLUDE_DIRS)]
+
+class GitCommandError(Exception):
+    def __init__(self, stderr: str):
+        super().__init__(stderr)
+        self.stderr = stderr
+
 class GitHubService:
+    _clone_slots: Optional[asyncio.Semaphore] = None
+    # Held only while a sync or checkout uses them, so idle mirrors cost nothing
+    _mirror_locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = weakref.WeakValueDictionary()
+    
+    @staticmethod
+    def mirror_path(repo_url: str) -> str:
+        """Location of the bare mirror cached for `repo_url` under UPLOAD_DIR"""
+        normalized = repo_url.rstrip('/').lower()
+        if normalized.endswith('.git'):
+            normalized = normalized[:-4]
+        digest = hashlib.sha1(normalized.encode()).hexdigest()
+        return os.path.abspath(os.path.join(settings.UPLOAD_DIR, "mirrors", f"{digest}.git"))
+    
     @staticmethod
-    async def clone_repository(repo_url: str) -> str:
-        if not GitHubService._is_valid_github_url(repo_url):
+    async def fetch_repository(repo_url: str) -> Tuple[str, str]:
+        """Create or incrementally update the mirror of a GitHub repo.
+
+        Returns (mirror_path, head_commit_sha).
+        """
+        if not GitHubService.is_allowed_repo_url(repo_url):
             raise HTTPException(status_code=400, detail="Invalid GitHub URL")
         
-        os.makedirs(settings.UPLOAD_DIR, exist_ok=True)
+        mirror = GitHubService.mirror_path(repo_url)
+        try:
+            commit_sha = await GitHubService.sync_mirror(repo_url, mirror)
+        except GitCommandError as e:
+            raise HTTPException(status_code=400, detail=f"Failed to clone repository: {e.stderr}")
+        except asyncio.TimeoutError:
+            raise HTTPException(status_code=408, detail="Repository clone timeout")
+        
+        return mirror, commit_sha
+    
+    @staticmethod
+    async def checkout_repository(mirror: str, commit_sha: str) -> str:
+        """Check `commit_sha` out of a mirror into a fresh directory under UPLOAD_DIR"""
+        checkout_path = os.path.abspath(os.path.join(settings.UPLOAD_DIR, str(uuid.uuid4())))
+        try:
+            await GitHubService.checkout(mirror, commit_sha, checkout_path)
+        except GitCommandError as e:
+            raise HTTPException(status_code=400, detail=f"Failed to check out repository: {e.stderr}")
+        except asyncio.TimeoutError:
+            raise HTTPException(status_code=408, detail="Repository checkout timeout")
         
-        unique_id = str(uuid.uuid4())
-        clone_path = os.path.join(settings.UPLOAD_DIR, unique_id)
+        return checkout_path
+    
+    @classmethod
+    async def sync_mirror(cls, repo_url: str, mirror: str) -> str:
+        """Blobless bare mirror of `repo_url`: cloned once, then updated with fetch.
+
+        Works with any URL git accepts, including file:// bare repositories.
+        Returns the SHA of the mirror's HEAD after the update.
+        """
+        async with cls._mirror_lock(mirror), cls._slots():
+            await asyncio.wait_for(cls._update_mirror(repo_url, mirror), timeout=settings.GIT_CLONE_TIMEOUT)
+            return (await cls._run_git("-C", mirror, "rev-parse", "HEAD")).strip()
+    
+    @staticmethod
+    async def _update_mirror(repo_url: str, mirror: str):
+        if os.path.isdir(mirror):
+            await GitHubService._run_git("-C", mirror, "fetch", "--prune", "--quiet", "origin")
+            return
         
+        os.makedirs(os.path.dirname(mirror), exist_ok=True)
         try:
-            subprocess.run(
-                ["git", "clone", "--depth", "1", repo_url, clone_path],
-                check=True,
-                capture_output=True,
-                timeout=60
+            await GitHubService._run_git("clone", "--bare", "--filter=blob:none", "--quiet", repo_url, mirror)
+            await GitHubService._run_git("-C", mirror, "config", "remote.origin.fetch", "+refs/heads/*:refs/heads/*")
+        except BaseException:
+            shutil.rmtree(mirror, ignore_errors=True)
+            raise
+    
+    @classmethod
+    async def checkout(cls, mirror: str, commit_sha: str, checkout_path: str, patterns: List[str] = SPARSE_PATTERNS):
+        """Sparse worktree of `commit_sha` from a mirror.
+
+        Only blobs matching `patterns` are downloaded; the full file list is still
+        available through `git ls-tree`.
+        """
+        async with cls._mirror_lock(mirror), cls._slots():
+            try:
+                await asyncio.wait_for(
+                    cls._sparse_worktree(mirror, commit_sha, checkout_path, patterns),
+                    timeout=settings.GIT_CLONE_TIMEOUT
+                )
+            except BaseException:
+                await cls.remove_checkout(mirror, checkout_path)
+                raise
+    
+    @staticmethod
+    async def _sparse_worktree(mirror: str, commit_sha: str, checkout_path: str, patterns: List[str]):
+        await GitHubService._run_git(
+            "-C", mirror, "worktree", "add", "--quiet", "--detach", "--no-checkout", checkout_path, commit_sha
+        )
+        await GitHubService._run_git(
+            "-C", checkout_path, "sparse-checkout", "set", "--no-cone", "--stdin",
+            stdin="\n".join(patterns) + "\n"
+        )
+        await GitHubService._run_git("-C", checkout_path, "checkout", "--quiet")
+    
+    @staticmethod
+    async def remove_checkout(mirror: str, checkout_path: str):
+        shutil.rmtree(checkout_path, ignore_errors=True)
+        try:
+            await GitHubService._run_git("-C", mirror, "worktree", "prune")
+        except GitCommandError:
+            pass
+    
+    @staticmethod
+    async def changed_files(mirror: str, old_sha: str, new_sha: str) -> Optional[List[str]]:
+        """Paths that differ between two commits, or None if the diff is unavailable"""
+        try:
+            output = await GitHubService._run_git(
+                "-C", mirror, "diff", "--name-only", "--no-renames", "-z", old_sha, new_sha
             )
-        except subprocess.CalledProcessError as e:
-            raise HTTPException(status_code=400, detail=f"Failed to clone repository: {e.stderr.decode()}")
-        except subprocess.TimeoutExpired:
-            raise HTTPException(status_code=408, detail="Repository clone timeout")
+        except GitCommandError:
+            return None
+        return [path for path in output.split("\0") if path]
+    
+    @classmethod
+    def _mirror_lock(cls, mirror: str) -> asyncio.Lock:
+        lock = cls._mirror_locks.get(mirror)
+        if lock is None:
+            lock = cls._mirror_locks[mirror] = asyncio.Lock()
+        return lock
+    
+    @classmethod
+    def _slots(cls) -> asyncio.Semaphore:
+        if cls._clone_slots is None:
+            cls._clone_slots = asyncio.Semaphore(settings.GIT_CLONE_CONCURRENCY)
+        return cls._clone_slots
+    
+    @staticmethod
+    async def _run_git(*args: str, stdin: Optional[str] = None) -> str:
+        process = await asyncio.create_subprocess_exec(
+            "git", *args,
+            stdin=asyncio.subprocess.PIPE if stdin is not None else asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            env={**os.environ, "GIT_TERMINAL_PROMPT": "0"}
+        )
+        try:
+            stdout, stderr = await process.communicate(stdin.encode() if stdin is not None else None)
+        except asyncio.CancelledError:
+            if process.returncode is None:
+                process.kill()
+                await process.wait()
+            raise
         
-        return clone_path
+        if process.returncode != 0:
+            raise GitCommandError(stderr.decode(errors="replace").strip())
+        return stdout.decode(errors="replace")
     
     @staticmethod
-    def _is_valid_github_url(url: str) -> bool:
+    def is_allowed_repo_url(url: str) -> bool:
+        """GitHub repository URLs, plus file:// repositories when GIT_ALLOW_FILE_URLS is set"""
+        if settings.GIT_ALLOW_FILE_URLS and url.startswith("file://"):
+            return True
         pattern = r'^https?://github\.com/[\w-]+/[\w.-]+/?$'
         return bool(re.match(pattern, url))
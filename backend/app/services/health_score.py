@@ -1,31 +1,31 @@
-import os
-from pathlib import Path
-from typing import Dict, List
+import json
+from typing import Dict
+from app.services.repo_scanner import RepoManifest
 
 class HealthScoreCalculator:
     @staticmethod
-    def calculate_health(project_path: str) -> Dict:
+    def calculate_health(manifest: RepoManifest) -> Dict:
         score = 0
         issues = []
         
         # Check package.json exists (+20)
-        if (Path(project_path) / "package.json").exists():
+        if manifest.exists("package.json"):
             score += 20
-        elif (Path(project_path) / "requirements.txt").exists():
+        elif manifest.exists("requirements.txt"):
             score += 20
         else:
             issues.append("Missing dependency file")
             score -= 10
         
         # Check dependencies valid (+20)
-        if HealthScoreCalculator._has_valid_dependencies(project_path):
+        if HealthScoreCalculator._has_valid_dependencies(manifest):
             score += 20
         else:
             issues.append("Invalid or missing dependencies")
         
         # Check environment config exists (+20)
         env_files = [".env", ".env.example", "config.py", "config.js"]
-        if any((Path(project_path) / f).exists() for f in env_files):
+        if any(manifest.exists(f) for f in env_files):
             score += 20
         else:
             issues.append("Missing environment config")
@@ -33,21 +33,21 @@ class HealthScoreCalculator:
         
         # Check README exists (+20)
         readme_files = ["README.md", "README.txt", "readme.md"]
-        if any((Path(project_path) / f).exists() for f in readme_files):
+        if any(manifest.exists(f) for f in readme_files):
             score += 20
         else:
             issues.append("Missing README")
             score -= 10
         
         # Check structured folders (+20)
-        if HealthScoreCalculator._has_structured_folders(project_path):
+        if HealthScoreCalculator._has_structured_folders(manifest):
             score += 20
         else:
             issues.append("Poor folder structure")
         
         # Check src folder not empty
-        src_path = Path(project_path) / "src"
-        if src_path.exists() and not any(src_path.iterdir()):
+        src_dirs, src_files = manifest.list_dir("src")
+        if manifest.is_dir("src") and not src_dirs and not src_files:
             issues.append("Empty src folder")
             score -= 10
         
@@ -64,35 +64,29 @@ class HealthScoreCalculator:
         }
     
     @staticmethod
-    def _has_valid_dependencies(project_path: str) -> bool:
-        package_json = Path(project_path) / "package.json"
-        requirements = Path(project_path) / "requirements.txt"
-        
-        if package_json.exists():
+    def _has_valid_dependencies(manifest: RepoManifest) -> bool:
+        if manifest.exists("package.json"):
             try:
-                import json
-                with open(package_json, 'r') as f:
-                    data = json.load(f)
-                    return bool(data.get('dependencies') or data.get('devDependencies'))
+                data = json.loads(manifest.read_text("package.json"))
+                return bool(data.get('dependencies') or data.get('devDependencies'))
             except:
                 return False
         
-        if requirements.exists():
+        if manifest.exists("requirements.txt"):
             try:
-                with open(requirements, 'r') as f:
-                    lines = [l.strip() for l in f if l.strip() and not l.startswith('#')]
-                    return len(lines) > 0
+                content = manifest.read_text("requirements.txt")
+                lines = [l.strip() for l in content.splitlines() if l.strip() and not l.startswith('#')]
+                return len(lines) > 0
             except:
                 return False
         
         return False
     
     @staticmethod
-    def _has_structured_folders(project_path: str) -> bool:
+    def _has_structured_folders(manifest: RepoManifest) -> bool:
         common_folders = ["src", "app", "components", "services", "routes", "models", "utils"]
-        path = Path(project_path)
         
-        found_folders = sum(1 for folder in common_folders if (path / folder).exists())
+        found_folders = sum(1 for folder in common_folders if manifest.exists(folder))
         return found_folders >= 2
     
     @staticmethod
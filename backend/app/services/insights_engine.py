@@ -1,12 +1,10 @@
-import os
-from pathlib import Path
 from typing import List, Dict
+from app.services.repo_scanner import RepoManifest
 
 class InsightsEngine:
     @staticmethod
-    def generate_insights(project_path: str, dependencies: Dict, health_score: Dict) -> List[Dict]:
+    def generate_insights(manifest: RepoManifest, dependencies: Dict, health_score: Dict) -> List[Dict]:
         insights = []
-        path = Path(project_path)
         
         # Framework insights
         if dependencies.get('frontend_framework') and dependencies.get('backend_framework'):
@@ -32,7 +30,7 @@ class InsightsEngine:
             })
         
         # Structure insights
-        if InsightsEngine._has_mvc_structure(path):
+        if InsightsEngine._has_mvc_structure(manifest):
             insights.append({
                 "type": "structure",
                 "icon": "📁",
@@ -50,7 +48,7 @@ class InsightsEngine:
             })
         
         # Security insights
-        security_check = InsightsEngine._check_security(path)
+        security_check = InsightsEngine._check_security(manifest)
         if security_check['has_env']:
             insights.append({
                 "type": "security",
@@ -90,7 +88,7 @@ class InsightsEngine:
             })
         
         # Documentation insights
-        if (path / "README.md").exists():
+        if manifest.exists("README.md"):
             insights.append({
                 "type": "documentation",
                 "icon": "📚",
@@ -99,7 +97,7 @@ class InsightsEngine:
             })
         
         # Testing insights
-        if InsightsEngine._has_tests(path):
+        if InsightsEngine._has_tests(manifest):
             insights.append({
                 "type": "testing",
                 "icon": "🧪",
@@ -126,18 +124,17 @@ class InsightsEngine:
         return insights
     
     @staticmethod
-    def _has_mvc_structure(path: Path) -> bool:
+    def _has_mvc_structure(manifest: RepoManifest) -> bool:
         mvc_folders = ["models", "views", "controllers"]
-        found = sum(1 for folder in mvc_folders if (path / folder).exists())
+        found = sum(1 for folder in mvc_folders if manifest.exists(folder))
         return found >= 2
     
     @staticmethod
-    def _check_security(path: Path) -> Dict:
+    def _check_security(manifest: RepoManifest) -> Dict:
         env_files = [".env", ".env.example", "config.py"]
-        has_env = any((path / f).exists() for f in env_files)
+        has_env = any(manifest.exists(f) for f in env_files)
         
-        gitignore = path / ".gitignore"
-        has_gitignore = gitignore.exists()
+        has_gitignore = manifest.exists(".gitignore")
         
         return {
             "has_env": has_env,
@@ -145,13 +142,13 @@ class InsightsEngine:
         }
     
     @staticmethod
-    def _has_tests(path: Path) -> bool:
+    def _has_tests(manifest: RepoManifest) -> bool:
         test_patterns = ["test", "tests", "__tests__", "spec"]
         
-        for item in path.rglob("*"):
-            if item.is_dir() and any(pattern in item.name.lower() for pattern in test_patterns):
+        for dirs, files in manifest.dirs.values():
+            if any(pattern in name.lower() for name in dirs for pattern in test_patterns):
                 return True
-            if item.is_file() and any(pattern in item.name.lower() for pattern in ["test_", "_test.", ".spec.", ".test."]):
+            if any(pattern in name.lower() for name in files for pattern in ["test_", "_test.", ".spec.", ".test."]):
                 return True
         
         return False
@@ -0,0 +1,325 @@
+import asyncio
+import contextlib
+import logging
+import threading
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+from fastapi import HTTPException
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.progress import JobCancelled, StageReporter
+from app.core.workers import worker_pools
+from app.services.pipeline import save_analysis
+
+logger = logging.getLogger(__name__)
+
+MAX_FINISHED_JOBS = 1000
+
+
+class JobStatus:
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+class AnalysisJob:
+    def __init__(self, workspace_id: str, user_id: str):
+        self.id = str(uuid.uuid4())
+        self.workspace_id = workspace_id
+        self.user_id = user_id
+        self.status = JobStatus.QUEUED
+        self.project_id: Optional[str] = None
+        self.doc_id: Optional[int] = None
+        self.project_name: Optional[str] = None
+        self.error: Optional[str] = None
+        self.created_at = datetime.utcnow()
+        self.started_at: Optional[datetime] = None
+        self.finished_at: Optional[datetime] = None
+        self.events: List[Dict] = []
+        self.saving = False
+        self.task: Optional[asyncio.Task] = None
+        self.cancel_flag = threading.Event()
+        # Manager-backed copies of cancel_flag held by worker processes running for the job
+        self.worker_cancel_flags: List[Any] = []
+        self._changed = asyncio.Event()
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in (JobStatus.DONE, JobStatus.FAILED, JobStatus.CANCELLED)
+
+    def add_event(self, event: Dict):
+        self.events.append({"seq": len(self.events), **event})
+        self.notify()
+
+    def notify(self):
+        """Wake everyone following the job"""
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    async def follow(self, after: int = -1, heartbeat: Optional[float] = None) -> AsyncIterator[Optional[Dict]]:
+        """Events with a seq past `after`, as they arrive, until the job finishes.
+
+        Yields None when nothing happened for `heartbeat` seconds.
+        """
+        position = after + 1
+        while True:
+            changed = self._changed
+            while position < len(self.events):
+                yield self.events[position]
+                position += 1
+            if self.is_finished:
+                return
+            try:
+                await asyncio.wait_for(changed.wait(), heartbeat)
+            except asyncio.TimeoutError:
+                yield None
+
+    def to_dict(self) -> Dict:
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "project_id": self.project_id,
+            "doc_id": self.doc_id,
+            "project_name": self.project_name,
+            "error": self.error,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at
+        }
+
+
+class _QueueSink:
+    """Picklable sink putting (key, event) pairs on a manager queue"""
+
+    def __init__(self, queue: Any, key: str):
+        self.queue = queue
+        self.key = key
+
+    def __call__(self, event: Dict):
+        self.queue.put((self.key, event))
+
+
+class WorkerEvents:
+    """One manager queue, drained by one thread, carrying events from every worker process.
+
+    Events are routed by the key their sink was created with; a None event marks the end
+    of a key's stream.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._queue: Optional[Any] = None
+        self._routes: Dict[str, Callable[[Optional[Dict]], None]] = {}
+
+    def queue(self) -> Any:
+        """The shared queue, starting its drainer on first use. Blocks; call from an executor."""
+        with self._lock:
+            if self._queue is None:
+                self._queue = worker_pools.get_manager().Queue()
+                threading.Thread(target=self._drain, args=(self._queue,), name="worker-events", daemon=True).start()
+            return self._queue
+
+    def route(self, key: str, handler: Callable[[Optional[Dict]], None]):
+        self._routes[key] = handler
+
+    def unroute(self, key: str):
+        self._routes.pop(key, None)
+
+    def _drain(self, queue: Any):
+        while True:
+            try:
+                key, event = queue.get()
+            except (OSError, EOFError):
+                break
+            handler = self._routes.get(key)
+            if handler is not None:
+                self._deliver(handler, event)
+        # The manager went away at shutdown; end every open stream
+        with self._lock:
+            if self._queue is queue:
+                self._queue = None
+        for handler in list(self._routes.values()):
+            self._deliver(handler, None)
+
+    @staticmethod
+    def _deliver(handler: Callable[[Optional[Dict]], None], event: Optional[Dict]):
+        try:
+            handler(event)
+        except RuntimeError:
+            # The receiving event loop has already closed
+            pass
+
+
+worker_events = WorkerEvents()
+
+
+class JobReporter(StageReporter):
+    """Reports straight onto a job from the event loop and its executor threads.
+
+    Worker processes cannot reach the job, so `in_worker` gives them a reporter backed by
+    the shared worker event queue and a manager event for as long as they run.
+    """
+
+    def __init__(self, job: AnalysisJob, loop: asyncio.AbstractEventLoop):
+        super().__init__(lambda event: loop.call_soon_threadsafe(job.add_event, event), job.cancel_flag)
+        self.job = job
+
+    @contextlib.asynccontextmanager
+    async def in_worker(self) -> AsyncIterator[StageReporter]:
+        loop = asyncio.get_running_loop()
+        queue = await loop.run_in_executor(None, worker_events.queue)
+        cancel = await loop.run_in_executor(None, lambda: worker_pools.get_manager().Event())
+        if self.job.cancel_flag.is_set():
+            await loop.run_in_executor(None, cancel.set)
+
+        key = uuid.uuid4().hex
+        drained = loop.create_future()
+
+        def deliver(event: Optional[Dict]):
+            # Runs on the drainer thread; callbacks keep the events in order
+            if event is None:
+                loop.call_soon_threadsafe(_settle, drained)
+            else:
+                loop.call_soon_threadsafe(self.job.add_event, event)
+
+        worker_events.route(key, deliver)
+        self.job.worker_cancel_flags.append(cancel)
+        try:
+            yield StageReporter(_QueueSink(queue, key), cancel)
+        finally:
+            self.job.worker_cancel_flags.remove(cancel)
+            try:
+                # Everything the worker reported is on the queue ahead of this
+                await loop.run_in_executor(None, queue.put, (key, None))
+                await drained
+            except (OSError, EOFError):
+                pass
+            finally:
+                worker_events.unroute(key)
+
+
+def _settle(future: asyncio.Future):
+    if not future.done():
+        future.set_result(None)
+
+
+class JobQueue:
+    """Runs analysis jobs in the background with bounded concurrency and depth"""
+
+    def __init__(self):
+        self.jobs: "OrderedDict[str, AnalysisJob]" = OrderedDict()
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._tasks = set()
+
+    @property
+    def pending(self) -> int:
+        return sum(1 for job in self.jobs.values() if not job.is_finished)
+
+    def submit(
+        self,
+        workspace_id: str,
+        user_id: str,
+        work: Callable[[StageReporter], Awaitable[Dict]],
+        cleanup: Optional[Callable[[], None]] = None
+    ) -> AnalysisJob:
+        """Queue `work`, a coroutine factory returning a pipeline result.
+
+        `work` reports its stages to the reporter it is given. `cleanup` runs once the
+        job is over, however it ended, including when it was cancelled before starting.
+        """
+        if self.pending >= settings.ANALYSIS_QUEUE_DEPTH:
+            raise HTTPException(status_code=503, detail="Analysis queue is full, try again later")
+
+        job = AnalysisJob(workspace_id, user_id)
+        self.jobs[job.id] = job
+        self._prune()
+
+        job.task = asyncio.create_task(self._run(job, work, cleanup))
+        self._tasks.add(job.task)
+        job.task.add_done_callback(self._tasks.discard)
+        return job
+
+    def get(self, job_id: str, workspace_id: str) -> Optional[AnalysisJob]:
+        job = self.jobs.get(job_id)
+        if job is None or job.workspace_id != workspace_id:
+            return None
+        return job
+
+    def cancel(self, job: AnalysisJob):
+        """Stop a job; stages already running in a worker process stop at their next stage"""
+        if job.is_finished:
+            raise HTTPException(status_code=409, detail="Job has already finished")
+        if job.saving:
+            raise HTTPException(status_code=409, detail="Job is already saving its results")
+
+        job.cancel_flag.set()
+        loop = asyncio.get_running_loop()
+        for flag in job.worker_cancel_flags:
+            loop.run_in_executor(None, flag.set)
+        job.task.cancel()
+
+    async def _run(self, job: AnalysisJob, work: Callable[[StageReporter], Awaitable[Dict]], cleanup: Optional[Callable[[], None]]):
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(settings.ANALYSIS_WORKERS)
+
+        loop = asyncio.get_running_loop()
+        try:
+            async with self._slots:
+                job.status = JobStatus.RUNNING
+                job.started_at = datetime.utcnow()
+                job.notify()
+
+                reporter = JobReporter(job, loop)
+                try:
+                    result = await work(reporter)
+                    job.saving = True
+                    await loop.run_in_executor(None, self._persist, job, result, reporter)
+                    job.status = JobStatus.DONE
+                except (JobCancelled, asyncio.CancelledError):
+                    job.error = "Cancelled"
+                    job.status = JobStatus.CANCELLED
+                except HTTPException as e:
+                    job.error = e.detail
+                    job.status = JobStatus.FAILED
+                except Exception as e:
+                    logger.error(f"Analysis job {job.id} failed: {str(e)}")
+                    job.error = str(e)
+                    job.status = JobStatus.FAILED
+        except asyncio.CancelledError:
+            # Cancelled while waiting for a free slot
+            if not job.is_finished:
+                job.error = "Cancelled"
+                job.status = JobStatus.CANCELLED
+        finally:
+            if cleanup:
+                try:
+                    cleanup()
+                except Exception as e:
+                    logger.error(f"Cleanup of analysis job {job.id} failed: {str(e)}")
+            job.finished_at = datetime.utcnow()
+            job.notify()
+
+    @staticmethod
+    def _persist(job: AnalysisJob, result: Dict, reporter: StageReporter):
+        db = SessionLocal()
+        try:
+            with reporter.stage("save") as details:
+                doc, project = save_analysis(db, job.workspace_id, job.user_id, result)
+                details["project_id"] = project.id
+            job.doc_id = doc.id
+            job.project_id = project.id
+            job.project_name = project.project_name
+        finally:
+            db.close()
+
+    def _prune(self):
+        finished = [job_id for job_id, job in self.jobs.items() if job.is_finished]
+        for job_id in finished[:max(0, len(finished) - MAX_FINISHED_JOBS)]:
+            del self.jobs[job_id]
+
+
+job_queue = JobQueue()
@@ -0,0 +1,101 @@
+import asyncio
+import os
+import time
+import uuid
+from typing import Callable, Dict, List, Optional, Tuple
+import PyPDF2
+from fastapi import HTTPException
+from app.core.config import settings
+from app.core.workers import worker_pools
+
+
+def count_pages(pdf_path: str) -> int:
+    return len(PyPDF2.PdfReader(pdf_path).pages)
+
+
+def extract_page_range(pdf_path: str, start: int, stop: int, deadline: float) -> List[str]:
+    """Text of pages [start, stop), one string per page.
+
+    Runs inside a worker process; each call opens its own reader. Stops early once the
+    wall-clock `deadline` passes, so abandoned batches free their worker quickly.
+    """
+    reader = PyPDF2.PdfReader(pdf_path)
+    pages = []
+    for i in range(start, stop):
+        if time.time() >= deadline:
+            break
+        pages.append(reader.pages[i].extract_text() + "\n")
+    return pages
+
+
+class PDFExtractor:
+    @staticmethod
+    async def extract_pages(
+        content: bytes,
+        progress: Optional[Callable[[int, int], None]] = None
+    ) -> Tuple[List[str], int]:
+        """Extract page texts on the process pool within the page and time budgets.
+
+        Returns the texts of the leading pages extracted in time, and the page count
+        of the whole document. `progress` is called with (pages done, pages planned).
+        """
+        os.makedirs(settings.UPLOAD_DIR, exist_ok=True)
+        pdf_path = os.path.join(settings.UPLOAD_DIR, f"{uuid.uuid4()}.pdf")
+        batches: Dict[asyncio.Future, int] = {}
+
+        try:
+            with open(pdf_path, "wb") as f:
+                f.write(content)
+
+            loop = asyncio.get_running_loop()
+            pool = worker_pools.get_pdf_pool()
+            deadline = loop.time() + settings.PDF_EXTRACT_TIMEOUT
+            # Workers only share the wall clock with us
+            worker_deadline = time.time() + settings.PDF_EXTRACT_TIMEOUT
+
+            page_count = await loop.run_in_executor(pool, count_pages, pdf_path)
+            planned = min(page_count, settings.PDF_MAX_PAGES)
+            step = settings.PDF_PAGES_PER_TASK
+
+            batches = {
+                loop.run_in_executor(
+                    pool, extract_page_range, pdf_path, start, min(start + step, planned), worker_deadline
+                ): start
+                for start in range(0, planned, step)
+            }
+            extracted: Dict[int, List[str]] = {}
+            pending = set(batches)
+
+            while pending:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                done, pending = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                for batch in done:
+                    extracted[batches[batch]] = batch.result()
+                if progress and done:
+                    progress(sum(len(pages) for pages in extracted.values()), planned)
+        except HTTPException:
+            raise
+        except Exception as e:
+            raise HTTPException(status_code=400, detail=f"Failed to extract PDF text: {str(e)}")
+        finally:
+            # Unstarted batches would only fail on the removed file; running ones stop at the deadline
+            for batch in batches:
+                batch.cancel()
+            if os.path.exists(pdf_path):
+                os.remove(pdf_path)
+
+        # Keep the pages in order up to the first batch that did not finish in full
+        pages: List[str] = []
+        for start in range(0, planned, step):
+            if start not in extracted:
+                break
+            pages.extend(extracted[start])
+            if len(extracted[start]) < min(step, planned - start):
+                break
+
+        if planned and not pages:
+            raise HTTPException(status_code=408, detail="PDF text extraction timed out")
+
+        return pages, page_count
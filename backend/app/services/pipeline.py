@@ -0,0 +1,171 @@
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import desc
+from sqlalchemy.orm import Session, joinedload, load_only
+from app.core.database import SessionLocal
+from app.core.progress import NULL_REPORTER, StageReporter
+from app.models.database import DocumentContent, Documentation, Project, content_digest
+from app.services.repo_scanner import RepoScanner, RepoManifest
+from app.services.analyzer import CodeAnalyzer, ANALYZER_VERSION
+from app.services.doc_generator import DocumentationGenerator
+from app.services.dependency_detector import DependencyDetector
+from app.services.health_score import HealthScoreCalculator
+from app.services.insights_engine import InsightsEngine
+from app.utils.api_detector import APIDetector
+
+
+def analyze_manifest(manifest: RepoManifest, carried: Optional[Dict] = None, reporter: StageReporter = NULL_REPORTER) -> Dict:
+    """Run the full analysis pipeline over a scanned project.
+
+    Detector results present in `carried` are reused instead of recomputed.
+    """
+    carried = carried or {}
+    with reporter.stage("analyze") as details:
+        analysis = CodeAnalyzer.analyze_project(manifest, carried)
+        details["language"] = analysis['detected_language']
+        details["framework"] = analysis.get('framework')
+        details["endpoints"] = len(analysis.get('api_endpoints') or [])
+        details["endpoints_reused"] = 'api_endpoints' in carried
+
+    with reporter.stage("readme") as details:
+        readme = DocumentationGenerator.generate_readme(analysis)
+        details["chars"] = len(readme)
+
+    with reporter.stage("dependencies") as details:
+        if 'dependencies' in carried:
+            dependencies = carried['dependencies']
+        else:
+            dependencies = DependencyDetector.detect_dependencies(manifest)
+        details["libraries"] = len(dependencies.get('libraries') or [])
+        details["reused"] = 'dependencies' in carried
+
+    with reporter.stage("health") as details:
+        assessment = assess_manifest(manifest, dependencies)
+        details["score"] = assessment["health"]["score"]
+        details["insights"] = len(assessment["insights"])
+
+    return {
+        "analysis": analysis,
+        "readme": readme,
+        "dependencies": dependencies,
+        "file_count": manifest.file_count,
+        "analyzer_version": ANALYZER_VERSION,
+        **assessment
+    }
+
+
+def assess_manifest(manifest: RepoManifest, dependencies: Dict) -> Dict:
+    """Health score and insights for a scanned project"""
+    health = HealthScoreCalculator.calculate_health(manifest)
+    insights = InsightsEngine.generate_insights(manifest, dependencies, health)
+    return {"health": health, "insights": insights}
+
+
+def analyze_git_checkout(repo_path: str, carried: Optional[Dict] = None, reporter: StageReporter = NULL_REPORTER) -> Dict:
+    """Analyze a sparse checkout using the full file list from its HEAD tree"""
+    with reporter.stage("scan") as details:
+        manifest = RepoScanner.scan_git(repo_path)
+        details["files"] = manifest.file_count
+    return analyze_manifest(manifest, carried, reporter)
+
+
+def assess_git_checkout(repo_path: str, dependencies: Dict) -> Dict:
+    """Recompute health and insights for a sparse checkout"""
+    return assess_manifest(RepoScanner.scan_git(repo_path), dependencies)
+
+
+def analyze_zip(zip_path: str, reporter: StageReporter = NULL_REPORTER) -> Dict:
+    """Analyze an uploaded archive in place, without extracting it"""
+    with reporter.stage("scan") as details:
+        manifest = RepoScanner.scan_zip(zip_path)
+        details["files"] = manifest.file_count
+    with manifest:
+        return analyze_manifest(manifest, reporter=reporter)
+
+
+def find_previous_analysis(workspace_id: str, repo_url: str) -> Optional[Dict]:
+    """Latest stored analysis of `repo_url` in this workspace made by the current analyzer"""
+    db = SessionLocal()
+    try:
+        project = db.query(Project).options(
+            load_only(Project.commit_sha, Project.dependencies_json),
+            joinedload(Project.content).load_only(DocumentContent.api_endpoints)
+        ).filter(
+            Project.workspace_id == workspace_id,
+            Project.repo_url == repo_url,
+            Project.analyzer_version == ANALYZER_VERSION,
+            Project.commit_sha.isnot(None)
+        ).order_by(desc(Project.created_at)).first()
+        if not project:
+            return None
+        return {
+            "commit_sha": project.commit_sha,
+            "dependencies": project.dependencies_json,
+            "api_endpoints": project.api_endpoints
+        }
+    finally:
+        db.close()
+
+
+def plan_carry_forward(previous: Dict, changed_paths: List[str]) -> Dict:
+    """Previous detector results whose inputs are untouched by `changed_paths`"""
+    carried = {}
+    if not any(path in DependencyDetector.MANIFEST_FILES for path in changed_paths):
+        carried["dependencies"] = previous["dependencies"]
+    if not any(path.endswith(APIDetector.SOURCE_EXTENSIONS) for path in changed_paths):
+        carried["api_endpoints"] = previous["api_endpoints"]
+    return carried
+
+
+def save_analysis(db: Session, workspace_id: str, user_id: str, result: Dict) -> Tuple[Documentation, Project]:
+    """Persist a pipeline result as Documentation and Project rows sharing one DocumentContent"""
+    analysis = result["analysis"]
+    readme = result["readme"]
+    file_count = result["file_count"]
+
+    fields = {
+        "summary": analysis['summary'],
+        "folder_structure": analysis['folder_structure'],
+        "tech_stack": analysis['tech_stack'],
+        "api_endpoints": analysis.get('api_endpoints'),
+        "readme_content": readme
+    }
+    digest = content_digest(fields)
+    content = db.query(DocumentContent).filter(DocumentContent.digest == digest).first()
+    if content is None:
+        content = DocumentContent(digest=digest, **fields)
+        db.add(content)
+
+    doc = Documentation(
+        workspace_id=workspace_id,
+        project_name=analysis['project_name'],
+        detected_language=analysis['detected_language'],
+        framework=analysis.get('framework'),
+        content=content
+    )
+    db.add(doc)
+    db.flush()
+
+    project = Project(
+        workspace_id=workspace_id,
+        user_id=user_id,
+        project_name=analysis['project_name'],
+        primary_language=analysis['detected_language'],
+        file_count=file_count,
+        readme_download_count=0,
+        dependencies_json=result["dependencies"],
+        analytics_json={"file_count": file_count, "language": analysis['detected_language']},
+        framework=analysis.get('framework'),
+        content=content,
+        repo_url=result.get("repo_url"),
+        commit_sha=result.get("commit_sha"),
+        analyzer_version=result.get("analyzer_version"),
+        health_json=result.get("health"),
+        insights_json=result.get("insights"),
+        health_version=result.get("analyzer_version")
+    )
+    db.add(project)
+    db.commit()
+    db.refresh(doc)
+    db.refresh(project)
+
+    return doc, project
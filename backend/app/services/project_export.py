@@ -0,0 +1,68 @@
+import re
+import tarfile
+from io import BytesIO
+from typing import AsyncIterator
+from sqlalchemy import select
+from sqlalchemy.orm import joinedload
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.database import Project
+from app.models.schemas import ProjectDetailResponse
+
+
+class _ChunkBuffer:
+    """Write target for a streaming tarfile that hands back what was written so far"""
+
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, data) -> int:
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks.clear()
+        return data
+
+
+class ProjectExporter:
+    @staticmethod
+    async def _workspace_projects(workspace_id: str) -> AsyncIterator[Project]:
+        """Workspace projects oldest first, fetched EXPORT_BATCH_SIZE rows at a time.
+
+        Opens its own session: the response body is produced after request dependencies exit.
+        """
+        async with AsyncSessionLocal() as db:
+            projects = await db.stream_scalars(
+                select(Project)
+                .options(joinedload(Project.content))
+                .where(Project.workspace_id == workspace_id)
+                .order_by(Project.created_at, Project.id)
+                .execution_options(yield_per=settings.EXPORT_BATCH_SIZE)
+            )
+            async for project in projects:
+                yield project
+
+    @staticmethod
+    async def ndjson(workspace_id: str) -> AsyncIterator[bytes]:
+        """One ProjectDetailResponse JSON object per line"""
+        async for project in ProjectExporter._workspace_projects(workspace_id):
+            yield ProjectDetailResponse.model_validate(project).model_dump_json().encode("utf-8") + b"\n"
+
+    @staticmethod
+    async def readme_tar(workspace_id: str) -> AsyncIterator[bytes]:
+        """Gzipped tar holding <project name>-<id>/README.md for every project"""
+        buffer = _ChunkBuffer()
+        with tarfile.open(fileobj=buffer, mode="w|gz") as archive:
+            async for project in ProjectExporter._workspace_projects(workspace_id):
+                readme = (project.readme_content or "").encode("utf-8")
+                name = re.sub(r"[^\w.-]+", "_", project.project_name or "project").strip("._") or "project"
+                member = tarfile.TarInfo(f"{name}-{project.id[:8]}/README.md")
+                member.size = len(readme)
+                member.mtime = int(project.created_at.timestamp()) if project.created_at else 0
+                archive.addfile(member, BytesIO(readme))
+                chunk = buffer.drain()
+                if chunk:
+                    yield chunk
+        yield buffer.drain()
@@ -0,0 +1,188 @@
+import os
+import json
+import zipfile
+import subprocess
+from collections import Counter
+from typing import Dict, Iterator, List, Optional, Tuple
+
+EXCLUDE_DIRS = {'.git', 'node_modules', '__pycache__', 'venv', 'env', 'dist', 'build', '.next'}
+
+
+class RepoManifest:
+    """In-memory index of a project tree built by a single scan.
+
+    Paths are root-relative and use forward slashes; the root directory is "".
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        self.name = os.path.basename(os.path.normpath(root))
+        self.files: List[str] = []
+        self.sizes: Dict[str, int] = {}
+        self.dirs: Dict[str, Tuple[List[str], List[str]]] = {}
+        self.extension_counts: Counter = Counter()
+
+    @property
+    def file_count(self) -> int:
+        return len(self.files)
+
+    def add_file(self, rel_path: str, size: int = 0):
+        self.files.append(rel_path)
+        self.sizes[rel_path] = size
+        self.extension_counts[os.path.splitext(rel_path)[1].lower()] += 1
+
+    def is_file(self, rel_path: str) -> bool:
+        return rel_path in self.sizes
+
+    def is_dir(self, rel_path: str) -> bool:
+        return rel_path in self.dirs
+
+    def exists(self, rel_path: str) -> bool:
+        return self.is_file(rel_path) or self.is_dir(rel_path)
+
+    def list_dir(self, rel_path: str = "") -> Tuple[List[str], List[str]]:
+        """Return (subdirectories, filenames) of a scanned directory"""
+        return self.dirs.get(rel_path, ([], []))
+
+    def full_path(self, rel_path: str) -> str:
+        return os.path.join(self.root, *rel_path.split('/'))
+
+    def read_text(self, rel_path: str, limit: Optional[int] = None) -> Optional[str]:
+        """Read a file as text, optionally capped at `limit` bytes"""
+        if not self.is_file(rel_path):
+            return None
+        try:
+            with open(self.full_path(rel_path), 'rb') as f:
+                data = f.read(limit) if limit else f.read()
+        except OSError:
+            return None
+        return data.decode('utf-8', errors='ignore')
+
+    def read_json(self, rel_path: str) -> Optional[Dict]:
+        content = self.read_text(rel_path)
+        if content is None:
+            return None
+        try:
+            return json.loads(content)
+        except ValueError:
+            return None
+
+
+class ZipManifest(RepoManifest):
+    """Read-only view of a ZIP archive built from its central directory.
+
+    Nothing is extracted; members are decompressed only when read.
+    """
+
+    def __init__(self, zip_path: str):
+        super().__init__(zip_path)
+        self.name = os.path.splitext(os.path.basename(zip_path))[0]
+        self.archive = zipfile.ZipFile(zip_path, 'r')
+        self.members: Dict[str, zipfile.ZipInfo] = {}
+
+    def full_path(self, rel_path: str) -> str:
+        return f"{self.root}!/{rel_path}"
+
+    def read_text(self, rel_path: str, limit: Optional[int] = None) -> Optional[str]:
+        info = self.members.get(rel_path)
+        if info is None:
+            return None
+        try:
+            with self.archive.open(info) as f:
+                data = f.read(limit) if limit else f.read()
+        except (OSError, zipfile.BadZipFile, RuntimeError):
+            return None
+        return data.decode('utf-8', errors='ignore')
+
+    def close(self):
+        self.archive.close()
+
+    def __enter__(self) -> "ZipManifest":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class RepoScanner:
+    @staticmethod
+    def scan_zip(zip_path: str) -> ZipManifest:
+        """Build a manifest from a ZIP central directory without extracting it"""
+        try:
+            manifest = ZipManifest(zip_path)
+        except zipfile.BadZipFile:
+            raise ValueError("Invalid ZIP file")
+
+        def entries() -> Iterator[Tuple[str, bool, int]]:
+            for info in manifest.archive.infolist():
+                rel_path = info.filename.replace('\\', '/')
+                if not info.is_dir():
+                    manifest.members.setdefault(RepoScanner._clean_path(rel_path), info)
+                yield rel_path, info.is_dir(), info.file_size
+
+        RepoScanner._index_entries(manifest, entries())
+        return manifest
+
+    @staticmethod
+    def scan_git(repo_path: str) -> RepoManifest:
+        """Build a manifest from the HEAD tree of a (possibly sparse) checkout.
+
+        The file list comes from git, so it is complete even when most blobs were
+        never downloaded; reads only succeed for checked-out files.
+        """
+        output = subprocess.run(
+            ["git", "-C", repo_path, "ls-tree", "-r", "-z", "HEAD"],
+            check=True,
+            capture_output=True
+        ).stdout.decode('utf-8', errors='replace')
+
+        manifest = RepoManifest(repo_path)
+
+        def entries() -> Iterator[Tuple[str, bool, int]]:
+            for record in output.split('\0'):
+                if not record:
+                    continue
+                meta, rel_path = record.split('\t', 1)
+                if meta.split()[1] != 'blob':
+                    continue
+                try:
+                    yield rel_path, False, os.path.getsize(manifest.full_path(rel_path))
+                except OSError:
+                    yield rel_path, False, 0
+
+        RepoScanner._index_entries(manifest, entries())
+        return manifest
+
+    @staticmethod
+    def _clean_path(path: str) -> str:
+        return '/'.join(p for p in path.split('/') if p and p != '.')
+
+    @staticmethod
+    def _index_entries(manifest: RepoManifest, entries: Iterator[Tuple[str, bool, int]]):
+        """Fill a manifest from (path, is_dir, size) records of a flat listing"""
+        children: Dict[str, Tuple[set, set]] = {"": (set(), set())}
+
+        for path, is_dir, size in entries:
+            parts = RepoScanner._clean_path(path).split('/')
+            if not parts[0] or '..' in parts or any(p in EXCLUDE_DIRS for p in parts[:-1]):
+                continue
+            if is_dir and parts[-1] in EXCLUDE_DIRS:
+                continue
+
+            dir_parts = parts if is_dir else parts[:-1]
+            for depth in range(len(dir_parts)):
+                parent = '/'.join(dir_parts[:depth])
+                children.setdefault(parent, (set(), set()))[0].add(dir_parts[depth])
+                children.setdefault('/'.join(dir_parts[:depth + 1]), (set(), set()))
+
+            if not is_dir:
+                rel_path = '/'.join(parts)
+                if manifest.is_file(rel_path):
+                    continue
+                children['/'.join(parts[:-1])][1].add(parts[-1])
+                manifest.add_file(rel_path, size)
+
+        for rel_dir, (subdirs, filenames) in children.items():
+            manifest.dirs[rel_dir] = (sorted(subdirs), sorted(filenames))
+
+        manifest.files.sort()
@@ -1,63 +1,474 @@
 import re
-from typing import Dict, List, Optional
+from collections import deque
+from concurrent.futures import Executor
+from typing import Dict, FrozenSet, Iterable, Iterator, List, Optional, Tuple
 from datetime import datetime
-from pathlib import Path
+from app.core.config import settings
+
+# Bump whenever summary output changes so cached summaries are recomputed
+ENGINE_VERSION = "2"
+
+
+def _trie_pattern(words) -> str:
+    """Alternation of literal words factored on shared prefixes, preferring the longest"""
+    trie: Dict = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = {}
+    
+    def build(node: Dict) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        return '(?:' + body + ')?' if '' in node else body
+    
+    return build(trie)
+
+
+class LineIndex:
+    """Document split into lines once: raw, stripped and lowercased"""
+    
+    def __init__(self, text: str):
+        self.raw = text.split('\n')
+        self.stripped = [line.strip() for line in self.raw]
+        self.lower = [line.lower() for line in self.raw]
+        self.lower_text = '\n'.join(self.lower)
+
+
+class KeywordMatcher:
+    """Multi-pattern substring matcher over named keyword groups.
+
+    Keywords are compiled into one trie-shaped alternation tried at every position,
+    together with the line break, so a single scan of the text yields every keyword
+    occurrence in line order. A keyword also counts for the groups of any shorter
+    keyword it contains, since the longest alternative wins at a given position.
+    """
+    
+    def __init__(self, groups: Dict[str, List[str]]):
+        owners: Dict[str, set] = {}
+        for group, keywords in groups.items():
+            for keyword in keywords:
+                owners.setdefault(keyword, set()).add(group)
+        
+        self.groups_for: Dict[str, FrozenSet[str]] = {
+            keyword: frozenset(g for other, gs in owners.items() if other in keyword for g in gs)
+            for keyword in owners
+        }
+        self.pattern = re.compile('(?=(' + _trie_pattern(owners) + '))|\n')
+    
+    def scan(self, text: str) -> Dict[str, List[int]]:
+        """Map each group to the ascending line numbers of `text` where it occurs"""
+        hits: Dict[str, List[int]] = {}
+        line = 0
+        seen = set()
+        
+        for keyword in self.pattern.findall(text + '\n'):
+            if keyword:
+                seen.add(keyword)
+                continue
+            for found in seen:
+                for group in self.groups_for[found]:
+                    lines = hits.setdefault(group, [])
+                    if not lines or lines[-1] != line:
+                        lines.append(line)
+            seen.clear()
+            line += 1
+        return hits
+
+
+class EntityScanner:
+    """Single-pass extractor for dates, versions, prices, percentages and deadlines.
+
+    Numeric entities are captured in lookaheads at every position that can start one,
+    and each type skips matches overlapping its previous one, so every type gets
+    exactly what its own `findall` would return. Month dates ("march 3") are found
+    from their day number, by checking for a month name right before it.
+    """
+    
+    FULL_MONTHS = [
+        'january', 'february', 'march', 'april', 'may', 'june',
+        'july', 'august', 'september', 'october', 'november', 'december'
+    ]
+    SHORT_MONTHS = ['jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec']
+    
+    NUMERIC_PATTERNS = {
+        "slash_date": r'\d{1,2}/\d{1,2}/\d{2,4}',
+        "iso_date": r'\d{4}-\d{2}-\d{2}',
+        "version": r'v?\d+\.\d+\.?\d*',
+        "price": r'\$\d+(?:,\d{3})*(?:\.\d{2})?',
+        "percent": r'\d+(?:\.\d+)?%',
+        "day": r'(?<=[^\S\n])\d{1,2}',
+    }
+    
+    # Deadline formats, most specific first; the first format found on a line wins
+    DEADLINE_KINDS = ("slash_date", "iso_date", "month", "short_month")
+    
+    def __init__(self):
+        captures = ''.join(
+            f'(?:(?=(?P<{name}>{pattern})))?' for name, pattern in self.NUMERIC_PATTERNS.items()
+        )
+        # Starting with a plain character class lets the regex engine skip ahead
+        # quickly; the lookbehind then evaluates every capture at that character.
+        self.pattern = re.compile(rf'[\d$v](?<=(?=\d|\$\d|v\d){captures}.)')
+        self.month_before = re.compile(
+            rf'(?ai:{_trie_pattern(set(self.FULL_MONTHS) | set(self.SHORT_MONTHS))})[^\S\n]+\Z'
+        )
+        self.full_months = frozenset(self.FULL_MONTHS)
+    
+    def scan(self, text: str) -> Tuple[Dict[str, List[str]], Dict[int, str]]:
+        """Return entity values by type, and the deadline found on each line"""
+        entities: Dict[str, List[str]] = {"date": [], "version": [], "price": [], "percent": []}
+        ends = dict.fromkeys(entities, 0)
+        line_spans: Dict[int, Dict[str, str]] = {}
+        line = 0
+        position = 0
+        
+        for match in self.pattern.finditer(text):
+            start = match.start()
+            line += text.count('\n', position, start)
+            position = start
+            
+            slash_date, iso_date, version, price, percent, day = match.groups()
+            date = slash_date or iso_date
+            for name, value in (("date", date), ("version", version), ("price", price), ("percent", percent)):
+                if value and start >= ends[name]:
+                    entities[name].append(value)
+                    ends[name] = start + len(value)
+            
+            if not (slash_date or iso_date or day):
+                continue
+            spans = line_spans.setdefault(line, {})
+            if slash_date:
+                spans.setdefault("slash_date", slash_date)
+            if iso_date:
+                spans.setdefault("iso_date", iso_date)
+            if day:
+                month = self.month_before.search(text, text.rfind('\n', 0, start) + 1, start)
+                if month:
+                    kind = "month" if month.group().rstrip().lower() in self.full_months else "short_month"
+                    spans.setdefault(kind, (month.group() + day).lower())
+        
+        deadlines = {}
+        for line, spans in line_spans.items():
+            for kind in self.DEADLINE_KINDS:
+                if kind in spans:
+                    deadlines[line] = spans[kind]
+                    break
+        return entities, deadlines
+
+
+class SummaryState:
+    """Extractor results for a block of consecutive lines, mergeable with the next block.
+
+    Lists keep only as many items as the final summary can use, so a state stays
+    small however much text it covers. Blocks must be cut at line breaks.
+    """
+    
+    MAX_LEADING_LINES = 10
+    MAX_PARAGRAPHS = 5
+    MAX_KEY_POINTS = 10
+    MAX_ACTIONS = 10
+    MAX_RISKS = 5
+    MAX_HIGHLIGHTS = 8
+    
+    BULLET_PATTERN = re.compile(r'^[\s]*[•\-\*]\s*(.+)$')
+    NUMBERED_PATTERN = re.compile(r'^[\s]*\d+[\.\)]\s*(.+)$')
+    
+    def __init__(self):
+        self.word_count = 0
+        self.groups = set()
+        self.nonblank_count = 0
+        self.leading_lines: List[str] = []
+        # Runs of long lines; the first/last may continue into neighbouring blocks
+        self.paragraphs: List[str] = []
+        self.paragraphs_truncated = False
+        self.starts_in_paragraph = False
+        self.ends_in_paragraph = False
+        self.bullets: List[str] = []
+        self.numbered: List[str] = []
+        self.key_lines: List[str] = []
+        self.actions: List[Dict] = []
+        self.deadlines: List[str] = []
+        self.risks: List[str] = []
+        self.highlights: List[str] = []
+        self.dates: Dict[str, None] = {}
+        self.versions: Dict[str, None] = {}
+        self.prices: Dict[str, None] = {}
+        self.percents: Dict[str, None] = {}
+        self.sender: Optional[str] = None
+        self.subject: Optional[str] = None
+    
+    @classmethod
+    def from_text(cls, text: str) -> "SummaryState":
+        """Run every extractor over one block of text"""
+        state = cls()
+        index = LineIndex(text)
+        hits = KEYWORD_MATCHER.scan(index.lower_text)
+        entities, deadlines = ENTITY_SCANNER.scan(text)
+        
+        state.word_count = len(text.split())
+        state.groups = set(hits)
+        
+        lines = [l for l in index.stripped if l]
+        state.nonblank_count = len(lines)
+        state.leading_lines = lines[:cls.MAX_LEADING_LINES]
+        state._collect_paragraphs(lines)
+        
+        for i, stripped in enumerate(index.stripped):
+            if stripped[:1] in ('•', '-', '*'):
+                match = cls.BULLET_PATTERN.match(index.raw[i])
+                if match:
+                    _add_distinct(state.bullets, [match.group(1).strip()], cls.MAX_KEY_POINTS)
+            elif stripped[:1].isdigit():
+                match = cls.NUMBERED_PATTERN.match(index.raw[i])
+                if match:
+                    _add_distinct(state.numbered, [match.group(1).strip()], cls.MAX_KEY_POINTS)
+        
+        for i in hits.get("key_point", []):
+            if 20 < len(index.raw[i]) < 200:
+                _add_distinct(state.key_lines, [index.stripped[i]], cls.MAX_KEY_POINTS)
+                if len(state.key_lines) == cls.MAX_KEY_POINTS:
+                    break
+        
+        high_priority = set(hits.get("high_priority", []))
+        for i in hits.get("action", [])[:cls.MAX_ACTIONS]:
+            state.actions.append({
+                "action": index.stripped[i],
+                "deadline": deadlines.get(i),
+                "priority": "high" if i in high_priority else "normal"
+            })
+        
+        state.deadlines = [deadlines[i] for i in hits.get("deadline_marker", []) if i in deadlines]
+        state.risks = [index.stripped[i] for i in hits.get("risk", []) if len(index.raw[i]) > 20][:cls.MAX_RISKS]
+        state.highlights = [
+            index.stripped[i] for i in hits.get("technical", []) if 20 < len(index.raw[i]) < 200
+        ][:cls.MAX_HIGHLIGHTS]
+        
+        state.dates = dict.fromkeys(entities["date"])
+        state.versions = dict.fromkeys(entities["version"])
+        state.prices = dict.fromkeys(entities["price"])
+        state.percents = dict.fromkeys(entities["percent"])
+        
+        from_match = re.search(r'from:\s*(.+)', index.lower_text)
+        if from_match:
+            state.sender = from_match.group(1).strip()
+        subject_match = re.search(r'subject:\s*(.+)', text, re.IGNORECASE)
+        if subject_match:
+            state.subject = subject_match.group(1).strip()
+        
+        return state
+    
+    def _collect_paragraphs(self, lines: List[str]):
+        """Group consecutive lines longer than 20 characters into paragraphs"""
+        if not lines:
+            return
+        
+        runs = []
+        current = []
+        for line in lines:
+            if len(line) > 20:
+                current.append(line)
+            elif current:
+                runs.append(' '.join(current))
+                current = []
+                if len(runs) > self.MAX_PARAGRAPHS:
+                    break
+        if current:
+            runs.append(' '.join(current))
+        
+        self.paragraphs = runs[:self.MAX_PARAGRAPHS]
+        self.paragraphs_truncated = len(runs) > self.MAX_PARAGRAPHS
+        self.starts_in_paragraph = len(lines[0]) > 20
+        self.ends_in_paragraph = len(lines[-1]) > 20
+    
+    def merge(self, other: "SummaryState") -> "SummaryState":
+        """Fold in the state of the block that directly follows this one"""
+        self.word_count += other.word_count
+        self.groups |= other.groups
+        
+        if other.nonblank_count:
+            if not self.paragraphs_truncated:
+                runs = other.paragraphs
+                if self.ends_in_paragraph and other.starts_in_paragraph:
+                    self.paragraphs[-1] += ' ' + runs[0]
+                    runs = runs[1:]
+                self.paragraphs += runs
+                self.paragraphs_truncated = other.paragraphs_truncated or len(self.paragraphs) > self.MAX_PARAGRAPHS
+                del self.paragraphs[self.MAX_PARAGRAPHS:]
+            if not self.nonblank_count:
+                self.starts_in_paragraph = other.starts_in_paragraph
+            self.ends_in_paragraph = other.ends_in_paragraph
+            self.nonblank_count += other.nonblank_count
+            self.leading_lines += other.leading_lines[:self.MAX_LEADING_LINES - len(self.leading_lines)]
+        
+        _add_distinct(self.bullets, other.bullets, self.MAX_KEY_POINTS)
+        _add_distinct(self.numbered, other.numbered, self.MAX_KEY_POINTS)
+        _add_distinct(self.key_lines, other.key_lines, self.MAX_KEY_POINTS)
+        self.actions += other.actions[:self.MAX_ACTIONS - len(self.actions)]
+        self.deadlines += other.deadlines
+        self.risks += other.risks[:self.MAX_RISKS - len(self.risks)]
+        self.highlights += other.highlights[:self.MAX_HIGHLIGHTS - len(self.highlights)]
+        
+        self.dates.update(other.dates)
+        self.versions.update(other.versions)
+        self.prices.update(other.prices)
+        self.percents.update(other.percents)
+        
+        # Header values that wrap onto the next block are not followed across it
+        if self.sender is None:
+            self.sender = other.sender
+        if self.subject is None:
+            self.subject = other.subject
+        return self
+
+
+def _add_distinct(items: List[str], new_items: List[str], limit: int):
+    """Append unseen values to `items` until it holds `limit` of them"""
+    for item in new_items:
+        if len(items) >= limit:
+            return
+        if item not in items:
+            items.append(item)
+
+
+def split_blocks(chunks: Iterable[str], block_size: int) -> Iterator[str]:
+    """Re-cut a stream of text pieces into blocks of about `block_size` characters.
+
+    Blocks end at line breaks, which are dropped, so joining the blocks with "\\n"
+    gives back the concatenated stream.
+    """
+    parts: List[str] = []
+    size = 0
+    
+    for chunk in chunks:
+        parts.append(chunk)
+        size += len(chunk)
+        if size < block_size:
+            continue
+        
+        text = ''.join(parts)
+        cut = text.rfind('\n')
+        if cut < 0:
+            parts = [text]
+            continue
+        yield text[:cut]
+        parts = [text[cut + 1:]]
+        size = len(parts[0])
+    
+    yield ''.join(parts)
+
 
 class AISummarizationEngine:
     """Enterprise AI Summarization - NO INFORMATION LOSS"""
     
+    KEYWORD_GROUPS = {
+        # Content type markers
+        "email_marker": ['from:', 'to:', 'subject:', 'dear', 'regards', 'sincerely'],
+        "technical_marker": ['function', 'class', 'import', 'def ', 'const ', 'var ', 'api', 'endpoint'],
+        "business_marker": ['meeting', 'deadline', 'budget', 'revenue', 'proposal', 'contract'],
+        "documentation_marker": ['overview', 'introduction', 'requirements', 'specification', 'documentation'],
+        # Line extractors
+        "key_point": ['must', 'required', 'critical', 'important', 'deadline', 'urgent', 'action', 'decision'],
+        "action": [
+            'please', 'need to', 'must', 'should', 'required to', 'action item',
+            'todo', 'task', 'complete', 'deliver', 'submit', 'review', 'approve'
+        ],
+        "high_priority": ['urgent', 'asap', 'critical'],
+        "deadline_marker": ['deadline', 'due'],
+        "risk": ['risk', 'warning', 'issue', 'problem', 'concern', 'blocker', 'critical', 'urgent'],
+        "technical": [
+            'api', 'endpoint', 'function', 'class', 'method', 'database',
+            'server', 'client', 'framework', 'library', 'version', 'dependency'
+        ],
+        # Email intelligence
+        "email_urgency": ['urgent', 'asap', 'immediately', 'critical'],
+        "email_request": ['please', 'could you', 'can you', 'need'],
+        "email_response": ['please reply', 'let me know', 'confirm', 'respond', 'feedback'],
+    }
+    
     def __init__(self):
         self.content_type = None
-        self.extracted_text = ""
         self.confidence = 100
+        self.state = SummaryState()
         
     def summarize(self, text: str, source_type: str = "auto") -> Dict:
         """Generate comprehensive summary preserving ALL critical info"""
-        self.extracted_text = text
-        self.content_type = self._detect_content_type(text) if source_type == "auto" else source_type
+        self.state = SummaryState.from_text(text)
+        return self._build_summary(source_type)
+    
+    def summarize_stream(self, chunks: Iterable[str], source_type: str = "auto",
+                         executor: Optional[Executor] = None) -> Dict:
+        """Summarize text arriving in pieces without holding it as one string.
+
+        Pieces are re-cut into blocks at line breaks and analyzed block by block,
+        map-reduce style across `executor` when one is given.
+        """
+        blocks = split_blocks(chunks, settings.SUMMARY_BLOCK_CHARS)
+        state = SummaryState()
+        
+        if executor is None:
+            for block in blocks:
+                state.merge(SummaryState.from_text(block))
+        else:
+            pending = deque()
+            for block in blocks:
+                pending.append(executor.submit(SummaryState.from_text, block))
+                if len(pending) > settings.SUMMARY_PENDING_BLOCKS:
+                    state.merge(pending.popleft().result())
+            while pending:
+                state.merge(pending.popleft().result())
+        
+        self.state = state
+        return self._build_summary(source_type)
+    
+    def _build_summary(self, source_type: str) -> Dict:
+        self.content_type = self._detect_content_type() if source_type == "auto" else source_type
         
         return {
             "short_summary": self._generate_short_summary(),
             "detailed_summary": self._generate_detailed_summary(),
             "key_points": self._extract_key_points(),
-            "action_items": self._extract_action_items(),
+            "action_items": self.state.actions,
             "important_numbers": self._extract_numbers(),
-            "risks_warnings": self._extract_risks(),
+            "risks_warnings": self.state.risks,
             "technical_highlights": self._extract_technical_highlights(),
             "email_intelligence": self._analyze_email() if self._is_email() else None,
             "metadata": {
                 "content_type": self.content_type,
-                "word_count": len(text.split()),
+                "word_count": self.state.word_count,
                 "confidence": self.confidence,
                 "extracted_at": datetime.utcnow().isoformat()
             }
         }
     
-    def _detect_content_type(self, text: str) -> str:
+    def _detect_content_type(self) -> str:
         """Auto-detect content type"""
-        text_lower = text.lower()
+        groups = self.state.groups
         
         # Email detection
-        if any(marker in text_lower for marker in ['from:', 'to:', 'subject:', 'dear', 'regards', 'sincerely']):
+        if "email_marker" in groups:
             return "email"
         
         # Technical detection
-        if any(marker in text_lower for marker in ['function', 'class', 'import', 'def ', 'const ', 'var ', 'api', 'endpoint']):
+        if "technical_marker" in groups:
             return "technical"
         
         # Business detection
-        if any(marker in text_lower for marker in ['meeting', 'deadline', 'budget', 'revenue', 'proposal', 'contract']):
+        if "business_marker" in groups:
             return "business"
         
         # Documentation detection
-        if any(marker in text_lower for marker in ['overview', 'introduction', 'requirements', 'specification', 'documentation']):
+        if "documentation_marker" in groups:
             return "documentation"
         
         return "mixed"
     
     def _generate_short_summary(self) -> str:
         """2-4 line summary preserving core meaning"""
-        lines = [l.strip() for l in self.extracted_text.split('\n') if l.strip()]
+        lines = self.state.leading_lines
         
         if not lines:
             return "No content to summarize"
@@ -80,161 +491,35 @@ class AISummarizationEngine:
     
     def _generate_detailed_summary(self) -> str:
         """Full meaning preserved summary"""
-        lines = [l.strip() for l in self.extracted_text.split('\n') if l.strip()]
-        
-        if len(lines) <= 10:
-            return '\n'.join(lines)
-        
-        # Extract key paragraphs
-        key_paras = []
-        current_para = []
-        
-        for line in lines:
-            if len(line) > 20:
-                current_para.append(line)
-            elif current_para:
-                key_paras.append(' '.join(current_para))
-                current_para = []
-        
-        if current_para:
-            key_paras.append(' '.join(current_para))
+        if self.state.nonblank_count <= 10:
+            return '\n'.join(self.state.leading_lines)
         
         # Return top paragraphs preserving structure
-        return '\n\n'.join(key_paras[:5])
+        return '\n\n'.join(self.state.paragraphs[:5])
     
     def _extract_key_points(self) -> List[str]:
         """Extract bullet points of critical info"""
-        points = []
-        text = self.extracted_text
-        
-        # Find existing bullet points
-        bullet_pattern = r'^[\s]*[•\-\*]\s*(.+)$'
-        for line in text.split('\n'):
-            match = re.match(bullet_pattern, line)
-            if match:
-                points.append(match.group(1).strip())
-        
-        # Find numbered points
-        numbered_pattern = r'^[\s]*\d+[\.\)]\s*(.+)$'
-        for line in text.split('\n'):
-            match = re.match(numbered_pattern, line)
-            if match:
-                points.append(match.group(1).strip())
-        
-        # Extract sentences with key indicators
-        key_indicators = ['must', 'required', 'critical', 'important', 'deadline', 'urgent', 'action', 'decision']
-        for line in text.split('\n'):
-            if any(indicator in line.lower() for indicator in key_indicators):
-                if len(line) > 20 and len(line) < 200:
-                    points.append(line.strip())
-        
+        points = self.state.bullets + self.state.numbered + self.state.key_lines
         return list(dict.fromkeys(points))[:10]  # Remove duplicates, max 10
     
-    def _extract_action_items(self) -> List[Dict]:
-        """Extract tasks and required actions"""
-        actions = []
-        text = self.extracted_text.lower()
-        
-        # Action keywords
-        action_keywords = [
-            'please', 'need to', 'must', 'should', 'required to', 'action item',
-            'todo', 'task', 'complete', 'deliver', 'submit', 'review', 'approve'
-        ]
-        
-        for line in self.extracted_text.split('\n'):
-            line_lower = line.lower()
-            if any(keyword in line_lower for keyword in action_keywords):
-                # Extract deadline if present
-                deadline = self._extract_deadline_from_line(line)
-                actions.append({
-                    "action": line.strip(),
-                    "deadline": deadline,
-                    "priority": "high" if any(w in line_lower for w in ['urgent', 'asap', 'critical']) else "normal"
-                })
-        
-        return actions[:10]
-    
-    def _extract_deadline_from_line(self, line: str) -> Optional[str]:
-        """Extract deadline from text"""
-        # Date patterns
-        date_patterns = [
-            r'\d{1,2}/\d{1,2}/\d{2,4}',
-            r'\d{4}-\d{2}-\d{2}',
-            r'(january|february|march|april|may|june|july|august|september|october|november|december)\s+\d{1,2}',
-            r'(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)\s+\d{1,2}'
-        ]
-        
-        for pattern in date_patterns:
-            match = re.search(pattern, line.lower())
-            if match:
-                return match.group(0)
-        
-        return None
-    
     def _extract_numbers(self) -> Dict:
         """Extract all important numbers"""
         numbers = {
-            "dates": [],
-            "metrics": [],
-            "versions": [],
-            "prices": [],
-            "deadlines": []
+            "dates": list(self.state.dates),
+            "metrics": list(self.state.percents),
+            "versions": list(self.state.versions)[:5],
+            "prices": list(self.state.prices),
+            "deadlines": self.state.deadlines
         }
         
-        # Dates
-        date_pattern = r'\d{1,2}/\d{1,2}/\d{2,4}|\d{4}-\d{2}-\d{2}'
-        numbers["dates"] = list(set(re.findall(date_pattern, self.extracted_text)))
-        
-        # Versions
-        version_pattern = r'v?\d+\.\d+\.?\d*'
-        numbers["versions"] = list(set(re.findall(version_pattern, self.extracted_text)))[:5]
-        
-        # Prices/Money
-        price_pattern = r'\$\d+(?:,\d{3})*(?:\.\d{2})?'
-        numbers["prices"] = list(set(re.findall(price_pattern, self.extracted_text)))
-        
-        # Percentages
-        percent_pattern = r'\d+(?:\.\d+)?%'
-        numbers["metrics"] = list(set(re.findall(percent_pattern, self.extracted_text)))
-        
-        # Deadlines (contextual)
-        for line in self.extracted_text.split('\n'):
-            if 'deadline' in line.lower() or 'due' in line.lower():
-                deadline = self._extract_deadline_from_line(line)
-                if deadline:
-                    numbers["deadlines"].append(deadline)
-        
         return {k: v for k, v in numbers.items() if v}
     
-    def _extract_risks(self) -> List[str]:
-        """Extract risks and warnings"""
-        risks = []
-        risk_keywords = ['risk', 'warning', 'issue', 'problem', 'concern', 'blocker', 'critical', 'urgent']
-        
-        for line in self.extracted_text.split('\n'):
-            if any(keyword in line.lower() for keyword in risk_keywords):
-                if len(line) > 20:
-                    risks.append(line.strip())
-        
-        return risks[:5]
-    
     def _extract_technical_highlights(self) -> Optional[List[str]]:
         """Extract technical details if present"""
         if self.content_type not in ['technical', 'mixed']:
             return None
         
-        highlights = []
-        tech_keywords = [
-            'api', 'endpoint', 'function', 'class', 'method', 'database',
-            'server', 'client', 'framework', 'library', 'version', 'dependency'
-        ]
-        
-        for line in self.extracted_text.split('\n'):
-            if any(keyword in line.lower() for keyword in tech_keywords):
-                if len(line) > 20 and len(line) < 200:
-                    highlights.append(line.strip())
-        
-        return highlights[:8] if highlights else None
+        return self.state.highlights if self.state.highlights else None
     
     def _is_email(self) -> bool:
         """Check if content is email"""
@@ -242,32 +527,20 @@ class AISummarizationEngine:
     
     def _analyze_email(self) -> Dict:
         """Email-specific intelligence"""
-        text_lower = self.extracted_text.lower()
+        groups = self.state.groups
         
         # Detect urgency
-        urgency = "high" if any(w in text_lower for w in ['urgent', 'asap', 'immediately', 'critical']) else "normal"
+        urgency = "high" if "email_urgency" in groups else "normal"
         
         # Detect intent
-        intent = "request" if any(w in text_lower for w in ['please', 'could you', 'can you', 'need']) else "informational"
+        intent = "request" if "email_request" in groups else "informational"
         
         # Detect if response required
-        response_required = any(w in text_lower for w in ['please reply', 'let me know', 'confirm', 'respond', 'feedback'])
-        
-        # Extract sender (if present)
-        sender = None
-        from_match = re.search(r'from:\s*(.+)', text_lower)
-        if from_match:
-            sender = from_match.group(1).strip()
-        
-        # Extract subject
-        subject = None
-        subject_match = re.search(r'subject:\s*(.+)', self.extracted_text, re.IGNORECASE)
-        if subject_match:
-            subject = subject_match.group(1).strip()
+        response_required = "email_response" in groups
         
         return {
-            "sender": sender,
-            "subject": subject,
+            "sender": self.state.sender,
+            "subject": self.state.subject,
             "intent": intent,
             "urgency": urgency,
             "response_required": response_required,
@@ -280,8 +553,19 @@ class AISummarizationEngine:
         return "Thank you for your email. I have reviewed the information and will [action]. I will follow up by [deadline]."
 
 
+KEYWORD_MATCHER = KeywordMatcher(AISummarizationEngine.KEYWORD_GROUPS)
+ENTITY_SCANNER = EntityScanner()
+
+
 # Integration function for API
 def summarize_document(text: str, source_type: str = "auto") -> Dict:
     """Main entry point for document summarization"""
     engine = AISummarizationEngine()
     return engine.summarize(text, source_type)
+
+
+def summarize_chunks(chunks: Iterable[str], source_type: str = "auto",
+                     executor: Optional[Executor] = None) -> Dict:
+    """Summarize a document given as consecutive pieces of text, e.g. PDF pages"""
+    engine = AISummarizationEngine()
+    return engine.summarize_stream(chunks, source_type, executor)
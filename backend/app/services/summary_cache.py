@@ -0,0 +1,161 @@
+import gzip
+import hashlib
+import json
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+from app.core.cache import LRUCache
+from app.core.config import settings
+from app.services.summarization_engine import ENGINE_VERSION
+
+class SummaryCache:
+    """Extracted text and summaries keyed by upload digest.
+
+    Entries are kept in an in-memory LRU in front of a size-bounded directory of
+    gzipped JSON files, so they survive restarts; disk entries are evicted by
+    least recent use (file mtime).
+
+    Keys are content addresses, not workspaces: every workspace that uploads the
+    same bytes shares one entry. That is intentional; an entry only holds what
+    was derived from those bytes, which the uploader already has. Lookups are
+    also counted per workspace so each one can see its own hit rate.
+    """
+
+    def __init__(self):
+        self.memory = LRUCache(
+            max_entries=settings.SUMMARY_CACHE_MAX_ENTRIES,
+            max_bytes=settings.SUMMARY_CACHE_MAX_BYTES,
+            size_of=lambda value: len(json.dumps(value, default=str))
+        )
+        self._disk_lock = threading.Lock()
+        self._disk_bytes: Optional[int] = None
+        self.disk_hits = 0
+        self._workspace_lock = threading.Lock()
+        self._workspace_lookups: "OrderedDict[str, Dict[str, int]]" = OrderedDict()
+
+    @staticmethod
+    def document_key(digest: str, filename: str) -> str:
+        """Identity of an upload; the extension decides how its text is extracted"""
+        return f"{digest}:{os.path.splitext(filename)[1].lower()}"
+
+    @staticmethod
+    def text_key(document_key: str) -> str:
+        return f"text:{document_key}"
+
+    @staticmethod
+    def summary_key(document_key: str, source_type: str) -> str:
+        return f"summary:{document_key}:{source_type}:{ENGINE_VERSION}"
+
+    def get(self, key: str) -> Optional[Any]:
+        value = self.memory.get(key)
+        if value is not None:
+            return value
+
+        path = self._path(key)
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                value = json.load(f)
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+
+        self.disk_hits += 1
+        self.memory.put(key, value)
+        return value
+
+    def put(self, key: str, value: Any):
+        self.memory.put(key, value)
+
+        os.makedirs(settings.SUMMARY_CACHE_DIR, exist_ok=True)
+        path = self._path(key)
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        try:
+            with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+                json.dump(value, f, default=str)
+            os.replace(tmp_path, path)
+            size = os.path.getsize(path)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+
+        with self._disk_lock:
+            if self._disk_bytes is None:
+                self._disk_bytes = self._scan_disk_bytes()
+            else:
+                self._disk_bytes += size
+            if self._disk_bytes > settings.SUMMARY_CACHE_DISK_MAX_BYTES:
+                self._evict_disk()
+
+    def record_lookup(self, workspace_id: str, hit: bool):
+        """Count a summary lookup against the workspace that made it"""
+        with self._workspace_lock:
+            counters = self._workspace_lookups.pop(workspace_id, None) or {"hits": 0, "misses": 0}
+            counters["hits" if hit else "misses"] += 1
+            self._workspace_lookups[workspace_id] = counters
+            while len(self._workspace_lookups) > settings.SUMMARY_CACHE_STATS_WORKSPACES:
+                self._workspace_lookups.popitem(last=False)
+
+    def workspace_stats(self, workspace_id: str) -> Dict:
+        with self._workspace_lock:
+            counters = dict(self._workspace_lookups.get(workspace_id) or {"hits": 0, "misses": 0})
+        lookups = counters["hits"] + counters["misses"]
+        return {
+            "workspace_id": workspace_id,
+            **counters,
+            "hit_rate": round(counters["hits"] / lookups, 4) if lookups else 0.0
+        }
+
+    def stats(self) -> Dict:
+        with self._disk_lock:
+            if self._disk_bytes is None:
+                self._disk_bytes = self._scan_disk_bytes()
+            disk_bytes = self._disk_bytes
+        return {**self.memory.stats(), "disk_hits": self.disk_hits, "disk_bytes": disk_bytes}
+
+    def _path(self, key: str) -> str:
+        name = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return os.path.join(settings.SUMMARY_CACHE_DIR, f"{name}.json.gz")
+
+    def _entries(self):
+        try:
+            with os.scandir(settings.SUMMARY_CACHE_DIR) as entries:
+                return [entry for entry in entries if entry.name.endswith(".json.gz")]
+        except FileNotFoundError:
+            return []
+
+    def _scan_disk_bytes(self) -> int:
+        total = 0
+        for entry in self._entries():
+            try:
+                total += entry.stat().st_size
+            except OSError:
+                continue
+        return total
+
+    def _evict_disk(self):
+        """Remove least recently used files until the directory fits its budget again"""
+        files = []
+        for entry in self._entries():
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, entry.path))
+        files.sort()
+
+        total = sum(size for _, size, _ in files)
+        for _, size, path in files:
+            if total <= settings.SUMMARY_CACHE_DISK_MAX_BYTES:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+        self._disk_bytes = total
+
+
+summary_cache = SummaryCache()
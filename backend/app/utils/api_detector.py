@@ -1,55 +1,59 @@
-import os
 import re
-from typing import List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Set
+from app.core.config import settings
+from app.services.repo_scanner import RepoManifest
 
 class APIDetector:
+    # Source files scanned for route declarations
+    SOURCE_EXTENSIONS = ('.py', '.js', '.ts')
+    
+    # Flask @app.route(...) plus FastAPI @app.<method>(...) / @router.<method>(...)
+    PYTHON_ROUTE_PATTERN = re.compile(
+        r'@(?:app\.route|(?:app|router)\.(?P<method>get|post|put|delete|patch))\(["\'](?P<route>[^"\']+)["\']'
+    )
+    # Express app.<method>(...) / router.<method>(...)
+    JS_ROUTE_PATTERN = re.compile(
+        r'(?:app|router)\.(?P<method>get|post|put|delete|patch)\(["\'](?P<route>[^"\']+)["\']'
+    )
+    
     @staticmethod
-    def detect_api_endpoints(project_path: str, files: List[str]) -> Optional[List[str]]:
-        endpoints = []
+    def detect_api_endpoints(manifest: RepoManifest) -> Optional[List[str]]:
+        source_files = [f for f in manifest.files if f.endswith(APIDetector.SOURCE_EXTENSIONS)]
+        if not source_files:
+            return None
         
-        python_files = [f for f in files if f.endswith('.py')]
-        for file_path in python_files[:30]:
-            endpoints.extend(APIDetector._extract_python_endpoints(file_path))
+        endpoints: Set[str] = set()
+        with ThreadPoolExecutor(max_workers=settings.API_SCAN_WORKERS) as pool:
+            for found in pool.map(lambda path: APIDetector._scan_file(manifest, path), source_files):
+                endpoints.update(found)
         
-        js_files = [f for f in files if f.endswith(('.js', '.ts'))]
-        for file_path in js_files[:30]:
-            endpoints.extend(APIDetector._extract_js_endpoints(file_path))
-        
-        return list(set(endpoints)) if endpoints else None
+        return sorted(endpoints) if endpoints else None
     
     @staticmethod
-    def _extract_python_endpoints(file_path: str) -> List[str]:
-        endpoints = []
-        try:
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
-                
-                flask_routes = re.findall(r'@app\.route\(["\']([^"\']+)["\']', content)
-                endpoints.extend([f"Flask: {route}" for route in flask_routes])
-                
-                fastapi_routes = re.findall(r'@router\.(get|post|put|delete|patch)\(["\']([^"\']+)["\']', content)
-                endpoints.extend([f"FastAPI {method.upper()}: {route}" for method, route in fastapi_routes])
-                
-                fastapi_app_routes = re.findall(r'@app\.(get|post|put|delete|patch)\(["\']([^"\']+)["\']', content)
-                endpoints.extend([f"FastAPI {method.upper()}: {route}" for method, route in fastapi_app_routes])
-        except:
-            pass
+    def _scan_file(manifest: RepoManifest, file_path: str) -> List[str]:
+        content = manifest.read_text(file_path, limit=settings.API_SCAN_MAX_FILE_BYTES)
+        if not content:
+            return []
         
-        return endpoints
+        if file_path.endswith('.py'):
+            return APIDetector._extract_python_endpoints(content)
+        return APIDetector._extract_js_endpoints(content)
     
     @staticmethod
-    def _extract_js_endpoints(file_path: str) -> List[str]:
+    def _extract_python_endpoints(content: str) -> List[str]:
         endpoints = []
-        try:
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
-                
-                express_routes = re.findall(r'app\.(get|post|put|delete|patch)\(["\']([^"\']+)["\']', content)
-                endpoints.extend([f"Express {method.upper()}: {route}" for method, route in express_routes])
-                
-                router_routes = re.findall(r'router\.(get|post|put|delete|patch)\(["\']([^"\']+)["\']', content)
-                endpoints.extend([f"Express {method.upper()}: {route}" for method, route in router_routes])
-        except:
-            pass
-        
+        for match in APIDetector.PYTHON_ROUTE_PATTERN.finditer(content):
+            method = match.group('method')
+            if method:
+                endpoints.append(f"FastAPI {method.upper()}: {match.group('route')}")
+            else:
+                endpoints.append(f"Flask: {match.group('route')}")
         return endpoints
+    
+    @staticmethod
+    def _extract_js_endpoints(content: str) -> List[str]:
+        return [
+            f"Express {match.group('method').upper()}: {match.group('route')}"
+            for match in APIDetector.JS_ROUTE_PATTERN.finditer(content)
+        ]
@@ -1,6 +1,5 @@
-import os
-from typing import List
 from collections import Counter
+from app.services.repo_scanner import RepoManifest
 
 class LanguageDetector:
     LANGUAGE_EXTENSIONS = {
@@ -24,9 +23,8 @@ class LanguageDetector:
     }
     
     @staticmethod
-    def detect_primary_language(files: List[str]) -> str:
-        extensions = [os.path.splitext(f)[1].lower() for f in files]
-        extension_count = Counter(extensions)
+    def detect_primary_language(manifest: RepoManifest) -> str:
+        extension_count = manifest.extension_counts
         
         language_count = Counter()
         for lang, exts in LanguageDetector.LANGUAGE_EXTENSIONS.items():
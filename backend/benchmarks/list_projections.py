@@ -0,0 +1,138 @@
+"""List projection benchmark.
+
+Seeds a scratch SQLite database with projects and documentation whose READMEs dominate
+the row size, then pages through a workspace listing twice: loading full ORM rows and
+loading only the columns of the list response schema. Reports latency and peak Python
+memory per page for each.
+
+    python benchmarks/list_projections.py --rows 5000 --readme-kb 64 --page-size 20
+
+Run from the backend directory with the usual environment (.env) so the app settings load.
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+import uuid
+from datetime import datetime, timedelta
+from typing import Dict, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session, joinedload, undefer_group
+from app.core.database import Base
+from app.core.migrations import run_migrations
+from app.core.pagination import keyset_page, next_cursor
+from app.models.database import DocumentContent, Documentation, Project, content_digest
+from app.models.schemas import DocumentationListItem, ProjectResponse
+from app.routes.documentation import LIST_COLUMNS as DOCUMENTATION_LIST_COLUMNS
+from app.routes.projects import LIST_COLUMNS as PROJECT_LIST_COLUMNS
+
+WORKSPACE = "bench_workspace"
+
+
+def seed(session: Session, rows: int, readme_kb: int):
+    readme = ("Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * (readme_kb * 18))[:readme_kb * 1024]
+    tree = "\n".join(f"src/module_{index}/file_{index}.py" for index in range(200))
+    started = datetime.utcnow()
+    for index in range(rows):
+        created_at = started - timedelta(seconds=index)
+        fields = {
+            "summary": "A generated project summary. " * 20,
+            "folder_structure": tree,
+            "tech_stack": {"language": "Python", "framework": "FastAPI"},
+            "api_endpoints": [f"GET /api/items/{n}" for n in range(30)],
+            "readme_content": f"# project-{index}\n" + readme
+        }
+        content = DocumentContent(digest=content_digest(fields), **fields)
+        session.add(Documentation(
+            workspace_id=WORKSPACE,
+            project_name=f"project-{index}",
+            detected_language="Python",
+            framework="FastAPI",
+            content=content,
+            created_at=created_at
+        ))
+        session.add(Project(
+            id=str(uuid.uuid4()),
+            workspace_id=WORKSPACE,
+            user_id="bench_user",
+            project_name=f"project-{index}",
+            primary_language="Python",
+            file_count=200,
+            readme_download_count=0,
+            dependencies_json={"libraries": ["fastapi", "sqlalchemy"], "frameworks": ["FastAPI"]},
+            analytics_json={"file_count": 200, "language": "Python"},
+            framework="FastAPI",
+            content=content,
+            health_json={"score": 80, "grade": "B", "issues": []},
+            insights_json=[{"type": "info", "message": "Benchmark row"}],
+            created_at=created_at
+        ))
+        if index % 500 == 499:
+            session.commit()
+    session.commit()
+
+
+def walk_pages(engine, model, options, schema, pages: int, page_size: int) -> Dict[str, List[float]]:
+    """Fetch and serialize `pages` consecutive listing pages, one session per page like a request"""
+    latencies, peaks = [], []
+    cursor = None
+    for _ in range(pages):
+        tracemalloc.start()
+        started = time.perf_counter()
+        with Session(engine) as session:
+            query = select(model).options(*options).where(model.workspace_id == WORKSPACE)
+            rows = list(session.scalars(keyset_page(query, model, cursor, page_size)).all())
+            cursor = next_cursor(rows, page_size)
+            [schema.model_validate(row).model_dump_json() for row in rows]
+        latencies.append((time.perf_counter() - started) * 1000)
+        peaks.append(tracemalloc.get_traced_memory()[1] / 1024)
+        tracemalloc.stop()
+        if not cursor:
+            break
+    return {"latency_ms": latencies, "peak_kb": peaks}
+
+
+def describe(samples: List[float], unit: str) -> str:
+    return f"p50={statistics.median(samples):.1f}{unit} max={max(samples):.1f}{unit}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--readme-kb", type=int, default=64)
+    parser.add_argument("--page-size", type=int, default=20)
+    parser.add_argument("--pages", type=int, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as scratch:
+        engine = create_engine(f"sqlite:///{os.path.join(scratch, 'bench.db')}")
+        Base.metadata.create_all(bind=engine)
+        run_migrations(engine)
+        with Session(engine) as session:
+            seed(session, args.rows, args.readme_kb)
+
+        cases: Dict[str, Tuple] = {
+            "projects, full rows": (Project, [joinedload(Project.content), undefer_group("assessment")], ProjectResponse),
+            "projects, projected": (Project, [PROJECT_LIST_COLUMNS], ProjectResponse),
+            "docs, full rows": (Documentation, [joinedload(Documentation.content)], DocumentationListItem),
+            "docs, projected": (Documentation, list(DOCUMENTATION_LIST_COLUMNS), DocumentationListItem)
+        }
+        print(f"{args.rows} rows, {args.readme_kb} KB READMEs, pages of {args.page_size}")
+        for name, (model, options, schema) in cases.items():
+            walk_pages(engine, model, options, schema, 2, args.page_size)
+            result = walk_pages(engine, model, options, schema, args.pages, args.page_size)
+            print(
+                f"{name:22} latency {describe(result['latency_ms'], 'ms')}  "
+                f"memory {describe(result['peak_kb'], 'KB')}"
+            )
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
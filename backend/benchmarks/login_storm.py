@@ -0,0 +1,117 @@
+"""Login storm benchmark.
+
+Measures the latency of a cheap authenticated endpoint while a burst of concurrent
+logins hits a running server. When password hashing is kept off the event loop,
+the probe percentiles under the storm should stay close to the idle ones.
+
+    python benchmarks/login_storm.py --base-url http://localhost:8000 --logins 200 --concurrency 32
+
+Requires httpx (pip install httpx).
+"""
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+from typing import Dict, List
+import httpx
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def describe(samples: List[float]) -> str:
+    if not samples:
+        return "no samples"
+    return (
+        f"n={len(samples)} p50={statistics.median(samples):.1f}ms "
+        f"p99={percentile(samples, 99):.1f}ms max={max(samples):.1f}ms"
+    )
+
+
+async def sign_up(client: httpx.AsyncClient, email: str, password: str) -> str:
+    response = await client.post("/api/auth/register", json={"name": "Storm", "email": email, "password": password})
+    if response.status_code not in (201, 400):
+        response.raise_for_status()
+    response = await client.post("/api/auth/login", json={"email": email, "password": password})
+    response.raise_for_status()
+    return response.json()["access_token"]
+
+
+async def probe(client: httpx.AsyncClient, path: str, token: str, stop: asyncio.Event, interval: float) -> List[float]:
+    """Request `path` until `stop` is set, returning latencies in milliseconds"""
+    latencies = []
+    headers = {"Authorization": f"Bearer {token}"}
+    while not stop.is_set():
+        started = time.perf_counter()
+        response = await client.get(path, headers=headers)
+        response.raise_for_status()
+        latencies.append((time.perf_counter() - started) * 1000)
+        await asyncio.sleep(interval)
+    return latencies
+
+
+async def storm(client: httpx.AsyncClient, email: str, password: str, logins: int, concurrency: int) -> Dict:
+    slots = asyncio.Semaphore(concurrency)
+    statuses: Dict[int, int] = {}
+    latencies = []
+
+    async def login():
+        async with slots:
+            started = time.perf_counter()
+            response = await client.post("/api/auth/login", json={"email": email, "password": password})
+            latencies.append((time.perf_counter() - started) * 1000)
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(login() for _ in range(logins)))
+    elapsed = time.perf_counter() - started
+    return {"elapsed": elapsed, "statuses": statuses, "latencies": latencies}
+
+
+async def main(args):
+    limits = httpx.Limits(max_connections=args.concurrency + 4)
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=args.timeout, limits=limits) as client:
+        email = args.email or f"storm-{uuid.uuid4().hex[:8]}@example.com"
+        token = await sign_up(client, email, args.password)
+
+        stop = asyncio.Event()
+        idle = asyncio.create_task(probe(client, args.probe_path, token, stop, args.probe_interval))
+        await asyncio.sleep(args.idle_seconds)
+        stop.set()
+        idle_latencies = await idle
+
+        stop = asyncio.Event()
+        busy = asyncio.create_task(probe(client, args.probe_path, token, stop, args.probe_interval))
+        result = await storm(client, email, args.password, args.logins, args.concurrency)
+        stop.set()
+        busy_latencies = await busy
+
+        print(f"probe {args.probe_path} idle:        {describe(idle_latencies)}")
+        print(f"probe {args.probe_path} under storm: {describe(busy_latencies)}")
+        print(
+            f"logins: {args.logins} in {result['elapsed']:.1f}s "
+            f"({args.logins / result['elapsed']:.1f}/s) statuses={result['statuses']} "
+            f"latency {describe(result['latencies'])}"
+        )
+
+        response = await client.get("/api/auth/hashing/stats", headers={"Authorization": f"Bearer {token}"})
+        if response.status_code == 200:
+            print(f"hashing pool: {response.json()}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure endpoint latency during a burst of logins")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--email", help="existing account to log in as; a fresh one is registered by default")
+    parser.add_argument("--password", default="storm-password")
+    parser.add_argument("--logins", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--probe-path", default="/api/auth/me")
+    parser.add_argument("--probe-interval", type=float, default=0.01)
+    parser.add_argument("--idle-seconds", type=float, default=3.0)
+    parser.add_argument("--timeout", type=float, default=120.0)
+    asyncio.run(main(parser.parse_args()))
@@ -1,28 +1,19 @@
-import sqlite3
-import os
+"""
+Apply pending schema migrations to the metadata database.
+
+The server runs these at startup as well; see app/core/migrations.py.
+"""
+
+import logging
+from app.core.database import engine, Base
+from app.core.migrations import run_migrations
+import app.models.database  # noqa: F401  registers the tables
 
 def migrate_database():
-    db_path = os.path.join(os.path.dirname(__file__), 'smartdoc.db')
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
-    
-    try:
-        cursor.execute("ALTER TABLE projects ADD COLUMN workspace_id VARCHAR NOT NULL DEFAULT 'legacy_workspace'")
-        cursor.execute("CREATE INDEX idx_projects_workspace_id ON projects(workspace_id)")
-        print("Added workspace_id to projects table")
-    except sqlite3.OperationalError as e:
-        print(f"Projects: {e}")
-    
-    try:
-        cursor.execute("ALTER TABLE documentations ADD COLUMN workspace_id VARCHAR NOT NULL DEFAULT 'legacy_workspace'")
-        cursor.execute("CREATE INDEX idx_documentations_workspace_id ON documentations(workspace_id)")
-        print("Added workspace_id to documentations table")
-    except sqlite3.OperationalError as e:
-        print(f"Documentations: {e}")
-    
-    conn.commit()
-    conn.close()
+    Base.metadata.create_all(bind=engine)
+    run_migrations(engine)
     print("Migration completed")
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
     migrate_database()
@@ -0,0 +1,32 @@
+import os
+import sys
+import tempfile
+
+# Settings are read at import time, so point the app at scratch storage first
+_scratch = tempfile.mkdtemp(prefix="smartdoc-tests-")
+os.environ.setdefault("MONGODB_URL", "mongodb://localhost:27017")
+os.environ.setdefault("JWT_SECRET_KEY", "test-secret")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_scratch, 'smartdoc.db')}"
+os.environ["UPLOAD_DIR"] = os.path.join(_scratch, "uploads")
+os.environ["SUMMARY_CACHE_DIR"] = os.path.join(_scratch, "summary_cache")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+from app.auth.routes import get_current_user
+
+USER = {"id": "user-1", "workspace_id": "workspace-1", "email": "dev@example.com", "name": "Dev"}
+
+
+@pytest.fixture
+def user():
+    return dict(USER)
+
+
+@pytest.fixture
+def client(user):
+    """Client signed in as `user`; startup hooks (MongoDB) are not run"""
+    app.dependency_overrides[get_current_user] = lambda: user
+    yield TestClient(app)
+    app.dependency_overrides.pop(get_current_user, None)
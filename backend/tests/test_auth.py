@@ -0,0 +1,91 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+
+mongomock_motor = pytest.importorskip("mongomock_motor")
+
+from app.auth import service as auth_service
+from app.auth.cache import auth_cache
+from app.auth.routes import get_current_user
+from app.auth.schemas import UserRegister
+from app.auth.service import AuthService
+from app.core.security import create_access_token
+from app.db.mongo import MongoDB, mongodb
+
+
+class RecordingCollection:
+    """Users collection that keeps every document find_one returned"""
+
+    def __init__(self, collection):
+        self.collection = collection
+        self.found = []
+
+    async def find_one(self, *args, **kwargs):
+        document = await self.collection.find_one(*args, **kwargs)
+        if document is not None:
+            self.found.append(document)
+        return document
+
+    def __getattr__(self, name):
+        return getattr(self.collection, name)
+
+
+@pytest.fixture
+def users(monkeypatch):
+    """In-memory users collection with the production indexes"""
+    monkeypatch.setattr(MongoDB, "client", mongomock_motor.AsyncMongoMockClient())
+    # bcrypt cost is irrelevant here
+    monkeypatch.setattr(auth_service, "hash_password", lambda password: f"hashed:{password}")
+    monkeypatch.setattr(auth_service, "verify_password", lambda password, hashed: hashed == f"hashed:{password}")
+    asyncio.run(mongodb.ensure_indexes())
+    auth_cache.tokens.clear()
+    auth_cache.users.clear()
+    collection = RecordingCollection(mongodb.get_users_collection())
+    monkeypatch.setattr(mongodb, "get_users_collection", lambda: collection)
+    return collection
+
+
+def registration(email: str = "dev@example.com") -> UserRegister:
+    return UserRegister(name="Dev", email=email, password="correct horse")
+
+
+def test_concurrent_duplicate_registration_is_rejected(users):
+    async def register_twice():
+        return await asyncio.gather(
+            AuthService.register_user(registration()),
+            AuthService.register_user(registration()),
+            return_exceptions=True
+        )
+
+    outcomes = asyncio.run(register_twice())
+
+    errors = [outcome for outcome in outcomes if isinstance(outcome, Exception)]
+    assert len(errors) == 1
+    assert isinstance(errors[0], HTTPException)
+    assert errors[0].status_code == 400
+    assert asyncio.run(users.count_documents({"email": "dev@example.com"})) == 1
+
+
+def test_profile_reads_omit_password_hash(users):
+    asyncio.run(AuthService.register_user(registration()))
+    users.found.clear()
+
+    profile = asyncio.run(AuthService.get_user_by_email("dev@example.com"))
+
+    assert profile["email"] == "dev@example.com"
+    assert users.found and all("hashed_password" not in document for document in users.found)
+
+
+def test_reregistered_user_is_not_served_from_cache(users):
+    asyncio.run(AuthService.register_user(registration()))
+    token = create_access_token(data={"sub": "dev@example.com", "workspace_id": "workspace-1"})
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+    assert asyncio.run(get_current_user(credentials))["name"] == "Dev"
+
+    # The account is removed and the email registered again while the old profile is cached
+    asyncio.run(users.delete_one({"email": "dev@example.com"}))
+    asyncio.run(AuthService.register_user(UserRegister(name="Someone Else", email="dev@example.com", password="battery staple")))
+
+    assert asyncio.run(get_current_user(credentials))["name"] == "Someone Else"
@@ -0,0 +1,46 @@
+import asyncio
+import hashlib
+import io
+import os
+import zipfile
+
+import pytest
+from fastapi import HTTPException, UploadFile
+
+from app.core.config import settings
+from app.services.file_handler import FileHandler
+
+
+def zip_bytes(size: int) -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_STORED) as archive:
+        archive.writestr("main.py", os.urandom(size))
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def upload_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "UPLOAD_DIR", str(tmp_path))
+    return tmp_path
+
+
+def test_zip_upload_is_copied_with_its_digest(upload_dir):
+    data = zip_bytes(3 * 1024 * 1024)
+
+    path, digest = asyncio.run(FileHandler.save_zip_upload(UploadFile(io.BytesIO(data), filename="repo.zip")))
+
+    with open(path, "rb") as f:
+        assert f.read() == data
+    assert digest == hashlib.sha256(data).hexdigest()
+
+
+def test_oversized_zip_upload_leaves_nothing_behind(upload_dir, monkeypatch):
+    monkeypatch.setattr(settings, "MAX_FILE_SIZE", 1024 * 1024)
+    # No declared size, so the limit is enforced while copying
+    upload = UploadFile(io.BytesIO(zip_bytes(2 * 1024 * 1024)), filename="repo.zip")
+
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(FileHandler.save_zip_upload(upload))
+
+    assert error.value.status_code == 400
+    assert os.listdir(upload_dir) == []
@@ -0,0 +1,106 @@
+import asyncio
+import os
+import subprocess
+import weakref
+
+import pytest
+from fastapi import HTTPException
+
+from app.core.config import settings
+from app.services.github_service import GitHubService
+
+
+def git(*args: str, cwd: str) -> str:
+    return subprocess.run(
+        ["git", *args], cwd=cwd, check=True, capture_output=True, text=True,
+        env={**os.environ, "GIT_AUTHOR_NAME": "Dev", "GIT_AUTHOR_EMAIL": "dev@example.com",
+             "GIT_COMMITTER_NAME": "Dev", "GIT_COMMITTER_EMAIL": "dev@example.com"}
+    ).stdout.strip()
+
+
+def write(root, path: str, text: str):
+    target = root / path
+    target.parent.mkdir(parents=True, exist_ok=True)
+    target.write_text(text)
+
+
+@pytest.fixture
+def origin(tmp_path, monkeypatch):
+    """Working repo plus the file:// URL of a bare repo it pushes to"""
+    monkeypatch.setattr(settings, "GIT_ALLOW_FILE_URLS", True)
+    monkeypatch.setattr(settings, "UPLOAD_DIR", str(tmp_path / "uploads"))
+    monkeypatch.setattr(GitHubService, "_clone_slots", None)
+    monkeypatch.setattr(GitHubService, "_mirror_locks", weakref.WeakValueDictionary())
+
+    work = tmp_path / "work"
+    bare = tmp_path / "origin.git"
+    work.mkdir()
+    git("init", "--quiet", "--initial-branch=main", cwd=str(work))
+    write(work, "main.py", "print('hello')\n")
+    write(work, "package.json", "{}\n")
+    write(work, "README.md", "# Demo\n")
+    write(work, "node_modules/lib/index.js", "module.exports = {}\n")
+    git("add", "-A", cwd=str(work))
+    git("commit", "--quiet", "-m", "first", cwd=str(work))
+    git("clone", "--bare", "--quiet", str(work), str(bare), cwd=str(tmp_path))
+    git("remote", "add", "origin", str(bare), cwd=str(work))
+    return work, f"file://{bare}"
+
+
+def test_mirror_and_sparse_checkout(origin):
+    work, url = origin
+
+    async def scenario():
+        mirror, sha = await GitHubService.fetch_repository(url)
+        checkout = await GitHubService.checkout_repository(mirror, sha)
+        try:
+            files = sorted(
+                os.path.relpath(os.path.join(root, name), checkout)
+                for root, _, names in os.walk(checkout) for name in names
+                if name != ".git"
+            )
+        finally:
+            await GitHubService.remove_checkout(mirror, checkout)
+        return mirror, sha, checkout, files
+
+    mirror, sha, checkout, files = asyncio.run(scenario())
+
+    assert mirror == GitHubService.mirror_path(url)
+    assert os.path.isdir(mirror)
+    assert sha == git("rev-parse", "HEAD", cwd=str(work))
+    assert files == ["main.py", "package.json"]
+    assert not os.path.exists(checkout)
+    # Mirror locks go away once nothing is syncing or checking out
+    assert len(GitHubService._mirror_locks) == 0
+
+
+def test_changed_files_between_fetches(origin):
+    work, url = origin
+
+    async def fetch():
+        return await GitHubService.fetch_repository(url)
+
+    mirror, old_sha = asyncio.run(fetch())
+
+    write(work, "main.py", "print('changed')\n")
+    write(work, "docs/guide.md", "Guide\n")
+    git("add", "-A", cwd=str(work))
+    git("commit", "--quiet", "-m", "second", cwd=str(work))
+    git("push", "--quiet", "origin", "main", cwd=str(work))
+
+    same_mirror, new_sha = asyncio.run(fetch())
+    changed = asyncio.run(GitHubService.changed_files(mirror, old_sha, new_sha))
+
+    assert same_mirror == mirror
+    assert new_sha != old_sha
+    assert sorted(changed) == ["docs/guide.md", "main.py"]
+    assert asyncio.run(GitHubService.changed_files(mirror, old_sha, "0" * 40)) is None
+
+
+def test_file_urls_rejected_by_default(origin, monkeypatch):
+    _, url = origin
+    monkeypatch.setattr(settings, "GIT_ALLOW_FILE_URLS", False)
+
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(GitHubService.fetch_repository(url))
+    assert error.value.status_code == 400
@@ -0,0 +1,45 @@
+import asyncio
+import threading
+
+import pytest
+
+from app.core.progress import StageReporter
+from app.core.workers import worker_pools
+from app.services.job_queue import AnalysisJob, JobReporter
+
+
+def report_stages(reporter: StageReporter, count: int) -> int:
+    for index in range(count):
+        with reporter.stage(f"step-{index}") as details:
+            details["index"] = index
+    return count
+
+
+@pytest.fixture
+def pools():
+    yield worker_pools
+    worker_pools.shutdown()
+
+
+def test_worker_events_reach_the_job_in_order(pools):
+    async def scenario():
+        job = AnalysisJob("workspace-1", "user-1")
+        reporter = JobReporter(job, asyncio.get_running_loop())
+
+        async def run_one():
+            async with reporter.in_worker() as worker_reporter:
+                await worker_pools.run_in_process(report_stages, worker_reporter, 3)
+            # Leaving the block delivers everything the worker reported
+            return len(job.events)
+
+        seen = await asyncio.gather(*(run_one() for _ in range(4)))
+        return job, seen
+
+    job, seen = asyncio.run(scenario())
+
+    assert len(job.events) == 4 * 3 * 2
+    assert max(seen) == len(job.events)
+    assert [event["seq"] for event in job.events] == list(range(len(job.events)))
+    # Every worker shares one drainer thread instead of holding an executor thread each
+    drainers = [thread for thread in threading.enumerate() if thread.name == "worker-events"]
+    assert len(drainers) == 1
@@ -0,0 +1,75 @@
+import uuid
+from datetime import datetime, timedelta
+import pytest
+from app.core.database import SessionLocal
+from app.models.database import DocumentContent, Documentation, Project
+
+
+@pytest.fixture
+def workspace(user):
+    """A fresh workspace holding 57 projects and documents, several sharing a created_at"""
+    user["workspace_id"] = f"workspace-{uuid.uuid4()}"
+    base = datetime(2026, 1, 1)
+    db = SessionLocal()
+    try:
+        for index in range(57):
+            created_at = base + timedelta(seconds=index // 4)
+            content = DocumentContent(digest=uuid.uuid4().hex, summary=f"summary {index}", folder_structure="",
+                                      tech_stack={}, readme_content=f"readme {index}")
+            db.add(Project(workspace_id=user["workspace_id"], user_id=user["id"], project_name=f"project-{index}",
+                           primary_language="Go" if index % 3 else "Python", created_at=created_at, content=content))
+            db.add(Documentation(workspace_id=user["workspace_id"], project_name=f"project-{index}",
+                                 detected_language="Python", created_at=created_at, content=content))
+        db.add(Project(workspace_id="someone-else", user_id="user-2", project_name="foreign", primary_language="Go"))
+        db.commit()
+    finally:
+        db.close()
+    return user["workspace_id"]
+
+
+def walk(client, url, **params):
+    """Follow X-Next-Cursor to the end, returning every row and the number of pages"""
+    rows, pages, cursor = [], 0, None
+    while True:
+        response = client.get(url, params={**params, **({"cursor": cursor} if cursor else {})})
+        assert response.status_code == 200, response.text
+        rows += response.json()
+        pages += 1
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            return rows, pages
+
+
+@pytest.mark.parametrize("sort_by", ["newest", "oldest"])
+def test_project_pages_have_no_gaps_or_duplicates(client, workspace, sort_by):
+    rows, pages = walk(client, "/api/projects/", limit=10, sort_by=sort_by)
+
+    ids = [row["id"] for row in rows]
+    assert len(ids) == len(set(ids)) == 57
+    assert pages == 6
+    keys = [(row["created_at"], row["id"]) for row in rows]
+    assert keys == sorted(keys, reverse=sort_by == "newest")
+
+
+def test_filtered_project_pages_are_complete(client, workspace):
+    rows, _ = walk(client, "/api/projects/", limit=7, language="Python")
+
+    assert sorted(row["project_name"] for row in rows) == sorted(f"project-{index}" for index in range(0, 57, 3))
+
+
+def test_documentation_pages_have_no_gaps_or_duplicates(client, workspace):
+    rows, pages = walk(client, "/api/docs/", limit=20)
+
+    assert len({row["id"] for row in rows}) == len(rows) == 57
+    assert pages == 3
+
+
+def test_user_projects_pages_have_no_gaps_or_duplicates(client, workspace):
+    rows, pages = walk(client, "/api/projects/user/me", limit=25)
+
+    assert len({row["id"] for row in rows}) == len(rows) == 57
+    assert pages == 3
+
+
+def test_invalid_cursor_is_rejected(client, workspace):
+    assert client.get("/api/projects/", params={"cursor": "not-a-cursor"}).status_code == 400
@@ -0,0 +1,86 @@
+import asyncio
+import io
+import os
+
+import pytest
+import PyPDF2
+from PyPDF2.generic import NameObject, NumberObject
+from fastapi import HTTPException
+
+from app.core.config import settings
+from app.core.workers import WorkerPools
+from app.services.pdf_extractor import PDFExtractor
+
+
+class RecordingExecutor:
+    """Executor that keeps the futures of everything submitted to it"""
+
+    def __init__(self, executor):
+        self.executor = executor
+        self.futures = []
+
+    def submit(self, *args, **kwargs):
+        future = self.executor.submit(*args, **kwargs)
+        self.futures.append(future)
+        return future
+
+
+def pdf_bytes(pages: int, broken_page: int = None) -> bytes:
+    writer = PyPDF2.PdfWriter()
+    for _ in range(pages):
+        writer.add_blank_page(100, 100)
+    if broken_page is not None:
+        # Contents must be a stream; extracting text from this page raises
+        writer.pages[broken_page][NameObject("/Contents")] = NumberObject(5)
+    buffer = io.BytesIO()
+    writer.write(buffer)
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def pdf_pool(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "UPLOAD_DIR", str(tmp_path))
+    monkeypatch.setattr(settings, "PDF_PAGES_PER_TASK", 1)
+    monkeypatch.setattr(WorkerPools, "pdf_pool", None)
+    pool = RecordingExecutor(WorkerPools.get_pdf_pool())
+    monkeypatch.setattr(WorkerPools, "get_pdf_pool", classmethod(lambda cls: pool))
+    yield pool
+    pool.executor.shutdown(wait=True, cancel_futures=True)
+
+
+def test_pages_are_extracted_in_order(pdf_pool, tmp_path):
+    pages, page_count = asyncio.run(PDFExtractor.extract_pages(pdf_bytes(5)))
+
+    assert page_count == 5
+    assert len(pages) == 5
+    assert os.listdir(tmp_path) == []
+
+
+def test_malformed_pdf_is_rejected(pdf_pool, tmp_path):
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(PDFExtractor.extract_pages(b"%PDF-1.4 not really a pdf"))
+
+    assert error.value.status_code == 400
+    assert os.listdir(tmp_path) == []
+
+
+def test_broken_page_cancels_queued_batches(pdf_pool, tmp_path):
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(PDFExtractor.extract_pages(pdf_bytes(200, broken_page=0)))
+
+    assert error.value.status_code == 400
+    assert os.listdir(tmp_path) == []
+    # Whatever had not reached a worker was cancelled rather than left to run on a deleted file
+    queued = [future for future in pdf_pool.futures if not future.done() and not future.running()]
+    assert queued == []
+    assert any(future.cancelled() for future in pdf_pool.futures)
+
+
+def test_expired_deadline_times_out(pdf_pool, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "PDF_EXTRACT_TIMEOUT", 0)
+
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(PDFExtractor.extract_pages(pdf_bytes(10)))
+
+    assert error.value.status_code == 408
+    assert os.listdir(tmp_path) == []
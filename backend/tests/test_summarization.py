@@ -0,0 +1,48 @@
+import json
+import os
+import uuid
+
+from app.main import app
+from app.auth.routes import get_current_user
+from app.core.config import settings
+from app.routes import summarization
+
+
+def test_cache_stats_are_reported_per_workspace(client, user, monkeypatch):
+    monkeypatch.setattr(summarization, "summarize_chunks", lambda chunks, source_type, pool: "A short summary.")
+    document = f"{uuid.uuid4()} " + "Plenty of words to summarize in this document. " * 10
+
+    for _ in range(2):
+        response = client.post("/api/summarize/summarize", files={"file": ("notes.txt", document.encode())})
+        assert response.status_code == 200
+
+    stats = client.get("/api/summarize/cache/stats").json()
+    assert stats["workspace_id"] == user["workspace_id"]
+    assert (stats["hits"], stats["misses"]) == (1, 1)
+    assert "shared" in stats
+
+    app.dependency_overrides[get_current_user] = lambda: {**user, "workspace_id": "workspace-2"}
+    response = client.post("/api/summarize/summarize", files={"file": ("notes.txt", document.encode())})
+    assert response.status_code == 200
+    other = client.get("/api/summarize/cache/stats").json()
+    # The content-addressed entry is shared, the counters are not
+    assert (other["workspace_id"], other["hits"], other["misses"]) == ("workspace-2", 1, 0)
+
+
+def test_batch_reports_oversized_files_and_summarizes_the_rest(client, monkeypatch):
+    monkeypatch.setattr(summarization, "summarize_chunks", lambda chunks, source_type, pool: "A short summary.")
+    monkeypatch.setattr(settings, "SUMMARY_BATCH_MAX_FILE_BYTES", 1024)
+    small = f"{uuid.uuid4()} " + "Plenty of words to summarize in this document. " * 10
+    files = [
+        ("files", ("small.txt", small.encode())),
+        ("files", ("large.txt", b"x" * 4096))
+    ]
+
+    response = client.post("/api/summarize/batch", files=files)
+
+    assert response.status_code == 200
+    lines = sorted((json.loads(line) for line in response.text.splitlines()), key=lambda line: line["index"])
+    assert [(line["filename"], line["status"]) for line in lines] == [("small.txt", "done"), ("large.txt", "failed")]
+    assert lines[1]["error"] == "File too large"
+    # Spooled copies are gone once the response is sent
+    assert not [name for name in os.listdir(settings.UPLOAD_DIR) if name.endswith(".batch")]
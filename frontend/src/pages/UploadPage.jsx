@@ -32,7 +32,7 @@ const UploadPage = () => {
       setProgress(100);
       setTimeout(() => navigate(`/projects/${response.project_id}`), 500);
     } catch (err) {
-      setError(err.response?.data?.detail || 'Failed to upload file');
+      setError(err.response?.data?.detail || err.message || 'Failed to upload file');
       setProgress(0);
     } finally {
       setLoading(false);
@@ -56,7 +56,7 @@ const UploadPage = () => {
       setProgress(100);
       setTimeout(() => navigate(`/projects/${response.project_id}`), 500);
     } catch (err) {
-      setError(err.response?.data?.detail || 'Failed to clone repository');
+      setError(err.response?.data?.detail || err.message || 'Failed to clone repository');
       setProgress(0);
     } finally {
       setLoading(false);
@@ -18,6 +18,33 @@ api.interceptors.request.use((config) => {
   return config;
 });
 
+const JOB_POLL_INTERVAL_MS = 1000;
+const USER_PROJECTS_PAGE_SIZE = 500;
+
+export const getJob = async (jobId) => {
+  const response = await api.get(`/jobs/${jobId}`);
+  return response.data;
+};
+
+export const cancelJob = async (jobId) => {
+  const response = await api.post(`/jobs/${jobId}/cancel`);
+  return response.data;
+};
+
+// Uploads are analyzed in the background; poll the job until it settles
+export const waitForJob = async (jobId) => {
+  while (true) {
+    const job = await getJob(jobId);
+    if (job.status === 'done') {
+      return job;
+    }
+    if (job.status === 'failed' || job.status === 'cancelled') {
+      throw new Error(job.error || 'Analysis failed');
+    }
+    await new Promise((resolve) => setTimeout(resolve, JOB_POLL_INTERVAL_MS));
+  }
+};
+
 export const uploadZip = async (file) => {
   const formData = new FormData();
   formData.append('file', file);
@@ -30,12 +57,12 @@ export const uploadZip = async (file) => {
     },
   });
   
-  return response.data;
+  return waitForJob(response.data.job_id);
 };
 
 export const uploadGithub = async (repoUrl) => {
   const response = await api.post('/upload/github', { repo_url: repoUrl });
-  return response.data;
+  return waitForJob(response.data.job_id);
 };
 
 export const getDocumentation = async (docId) => {
@@ -69,9 +96,18 @@ export const deleteProject = async (projectId) => {
   return response.data;
 };
 
+// The listing is paged; follow X-Next-Cursor so the dashboard sees every project
 export const getUserProjects = async () => {
-  const response = await api.get('/projects/user/me');
-  return response.data;
+  const projects = [];
+  let cursor = null;
+  do {
+    const params = { limit: USER_PROJECTS_PAGE_SIZE };
+    if (cursor) params.cursor = cursor;
+    const response = await api.get('/projects/user/me', { params });
+    projects.push(...response.data);
+    cursor = response.headers['x-next-cursor'];
+  } while (cursor);
+  return projects;
 };
 
 // Auth APIs